@@ -1,7 +1,75 @@
-def suma_2(a, b):
-    return a + b
+import numpy as np
 
-def resta_2(a, b):
-    return a - b
+# Elementos por bloque en suma_resta: los dos resultados se calculan mientras
+# el bloque de las entradas sigue en la caché
+TAMANO_BLOQUE = 2**16
 
-x = 2
\ No newline at end of file
+
+def suma_2(a, b, out=None):
+    # Con arrays de NumPy, a + b ya opera elemento a elemento con broadcasting
+    if out is None:
+        return a + b
+    return np.add(a, b, out=out)
+
+
+def resta_2(a, b, out=None):
+    if out is None:
+        return a - b
+    return np.subtract(a, b, out=out)
+
+
+def suma_resta(a, b, out=None):
+    """
+    Devuelve (a + b, a - b) recorriendo a y b una sola vez, por bloques.
+
+    `out` puede ser una tupla con dos arrays donde guardar los resultados.
+    """
+    if np.isscalar(a) and np.isscalar(b) and out is None:
+        return a + b, a - b
+    a, b = np.broadcast_arrays(np.asarray(a), np.asarray(b))
+    if out is None:
+        tipo = np.result_type(a, b)
+        out = (np.empty(a.shape, dtype=tipo), np.empty(a.shape, dtype=tipo))
+    suma, resta = out
+    # Las mismas comprobaciones que np.add(..., out=...)
+    if suma.shape != a.shape or resta.shape != a.shape:
+        raise ValueError("Los arrays de 'out' tienen que tener forma {}".format(a.shape))
+    tipo = np.result_type(a, b)
+    for destino in (suma, resta):
+        if not np.can_cast(tipo, destino.dtype, casting="same_kind"):
+            raise TypeError("No se puede guardar {} en un array de 'out' de tipo {}"
+                            .format(tipo, destino.dtype))
+    if not (suma.flags.c_contiguous and resta.flags.c_contiguous):
+        raise ValueError("Los arrays de 'out' tienen que ser contiguos")
+    # 'out' puede ser una de las entradas (out=(a, b)). Si ocupa exactamente
+    # las mismas posiciones basta con calcular cada bloque antes de escribirlo;
+    # si se solapa de otra forma se trabaja con una copia de la entrada
+    a = _sin_solapar(a, suma, resta)
+    b = _sin_solapar(b, suma, resta)
+    plano_a, plano_b = a.reshape(-1), b.reshape(-1)
+    plano_suma, plano_resta = suma.reshape(-1), resta.reshape(-1)
+    diferencia = np.empty(min(TAMANO_BLOQUE, plano_a.size), dtype=resta.dtype)
+    for inicio in range(0, plano_a.size, TAMANO_BLOQUE):
+        bloque = slice(inicio, inicio + TAMANO_BLOQUE)
+        bloque_a, bloque_b = plano_a[bloque], plano_b[bloque]
+        temporal = diferencia[:len(bloque_a)]
+        # La resta se guarda aparte: escribir la suma puede pisar a o b
+        np.subtract(bloque_a, bloque_b, out=temporal)
+        np.add(bloque_a, bloque_b, out=plano_suma[bloque])
+        plano_resta[bloque] = temporal
+    return suma, resta
+
+
+def _mismas_posiciones(x, y):
+    return (x.__array_interface__["data"][0] == y.__array_interface__["data"][0]
+            and x.shape == y.shape and x.strides == y.strides
+            and x.dtype.itemsize == y.dtype.itemsize)
+
+
+def _sin_solapar(entrada, *destinos):
+    for destino in destinos:
+        if np.shares_memory(entrada, destino) and not _mismas_posiciones(entrada, destino):
+            return entrada.copy()
+    return entrada
+
+x = 2
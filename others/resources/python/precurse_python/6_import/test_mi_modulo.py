@@ -0,0 +1,24 @@
+import numpy as np
+
+from mi_modulo import suma_resta, TAMANO_BLOQUE
+
+
+def test_suma_resta_en_las_entradas():
+    n = 2 * TAMANO_BLOQUE + 5
+    a = np.arange(n, dtype=float)
+    b = np.full(n, 10.)
+    suma_esperada, resta_esperada = a + b, a - b
+    suma, resta = suma_resta(a, b, out=(a, b))
+    assert suma is a and resta is b
+    np.testing.assert_array_equal(suma, suma_esperada)
+    np.testing.assert_array_equal(resta, resta_esperada)
+
+
+def test_suma_resta_con_out_desplazado():
+    datos = np.arange(10, dtype=float)
+    a = datos[1:]
+    b = np.ones(9)
+    esperado = (a + b, a - b)
+    suma, resta = suma_resta(a, b, out=(datos[:-1], np.empty(9)))
+    np.testing.assert_array_equal(suma, esperado[0])
+    np.testing.assert_array_equal(resta, esperado[1])
@@ -0,0 +1,41 @@
+"""
+Importaciones perezosas.
+
+`import pandas as pd` tarda alrededor de un segundo aunque el módulo que lo
+importa no llegue a usar pandas. Con lazy_import el módulo se busca al
+importarlo (si no existe falla en ese momento, como un import normal), pero
+su código se ejecuta la primera vez que se accede a uno de sus atributos:
+
+    pd = lazy_import("pandas")      # comprueba que pandas existe
+    pd.DataFrame()                  # aquí se ejecuta pandas
+
+Usa importlib.util.LazyLoader de la librería estándar. Las carpetas que lo
+necesitan añaden others/resources/python/utils a sys.path.
+"""
+import importlib.util
+import sys
+
+
+def lazy_import(nombre):
+    """
+    Devuelve el módulo `nombre`. Si todavía no está importado, lo registra
+    en sys.modules con un LazyLoader, que lo ejecuta al usarlo por primera vez.
+
+    Raises:
+        ModuleNotFoundError: Si el módulo no existe.
+    """
+    if nombre in sys.modules:
+        return sys.modules[nombre]
+    # find_spec importa los paquetes padre (para "s.j", el paquete "s")
+    spec = importlib.util.find_spec(nombre)
+    if spec is None:
+        raise ModuleNotFoundError("No module named '{}'".format(nombre), name=nombre)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[nombre] = modulo
+    loader.exec_module(modulo)
+    padre, _, hijo = nombre.rpartition(".")
+    if padre:
+        setattr(sys.modules[padre], hijo, modulo)
+    return modulo
@@ -0,0 +1,146 @@
+"""
+Inicialización de módulos declarada con hooks.
+
+Todo lo que se ejecuta a nivel de módulo (prints, cálculos, bucles...) se
+ejecuta en cada importación y en cada proceso. Con este módulo ese trabajo se
+declara como hooks de inicialización:
+
+    from module_init import init_hook, finish_init
+
+    @init_hook
+    def banner():
+        print("Ejecución de 'a'")
+
+    @init_hook(cache=True)
+    def tabla():
+        return calculo_muy_lento()      # se guarda en disco
+
+    finish_init(__name__)
+
+- Cada hook se ejecuta como mucho una vez por proceso; llamar a `tabla()`
+  devuelve el resultado ya calculado.
+- Con cache=True el resultado se guarda con pickle en disco, con una clave
+  que depende del código fuente del módulo. Los demás procesos (por ejemplo
+  los de un Pool) lo leen en lugar de recalcularlo, hasta que se edite el
+  fichero. Solo debe usarse con hooks sin efectos secundarios.
+- finish_init ejecuta los hooks del módulo al importarlo, como hasta ahora.
+  En modo "lazy" (variable de entorno MODULE_INIT=lazy o set_mode("lazy"),
+  que heredan los procesos hijos) no ejecuta nada: importar el módulo no
+  imprime ni se queda colgado, y los hooks se ejecutan con run_init o al
+  llamarlos.
+
+Las carpetas que lo usan añaden others/resources/python/utils a sys.path.
+"""
+import hashlib
+import os
+import pickle
+import sys
+
+ENV_MODE = "MODULE_INIT"
+ENV_CACHE = "MODULE_INIT_CACHE"
+
+_hooks = {}
+
+
+def get_mode():
+    """'eager' (por defecto) o 'lazy'."""
+    return os.environ.get(ENV_MODE, "eager")
+
+
+def set_mode(mode):
+    """Cambia el modo de este proceso y de los procesos que lance después."""
+    if mode not in ("eager", "lazy"):
+        raise ValueError("mode tiene que ser 'eager' o 'lazy'")
+    os.environ[ENV_MODE] = mode
+
+
+def cache_dir():
+    default = os.path.join(os.path.expanduser("~"), ".cache", "module_init")
+    return os.environ.get(ENV_CACHE, default)
+
+
+def _source_hash(module_name):
+    """Hash del código fuente del módulo, o None si no tiene fichero."""
+    path = getattr(sys.modules.get(module_name), "__file__", None)
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class InitHook:
+    """
+    Hook de inicialización: se ejecuta como mucho una vez por proceso y,
+    con `cache`, como mucho una vez por versión del código fuente.
+    """
+
+    def __init__(self, func, cache=False):
+        self.func = func
+        self.cache = cache
+        self.module = func.__module__
+        self.name = func.__qualname__
+        self.done = False
+        self.result = None
+        self.__doc__ = func.__doc__
+
+    def _cache_path(self):
+        source_hash = _source_hash(self.module)
+        if source_hash is None:
+            return None
+        key = "{}|{}|{}|{}".format(self.module, self.name, source_hash,
+                                   sys.version_info[:2])
+        return os.path.join(cache_dir(), hashlib.sha256(key.encode()).hexdigest() + ".pkl")
+
+    def __call__(self):
+        if self.done:
+            return self.result
+        path = self._cache_path() if self.cache else None
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                self.result = pickle.load(f)
+        else:
+            self.result = self.func()
+            if path:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Se escribe en un fichero temporal para que otro proceso
+                # nunca lea un pickle a medias
+                tmp = "{}.{}.tmp".format(path, os.getpid())
+                with open(tmp, "wb") as f:
+                    pickle.dump(self.result, f)
+                os.replace(tmp, path)
+        self.done = True
+        return self.result
+
+    def __repr__(self):
+        return "<InitHook {}.{}{}>".format(self.module, self.name,
+                                          " (ejecutado)" if self.done else "")
+
+
+def init_hook(func=None, cache=False):
+    """
+    Decorador que registra `func` como hook de inicialización de su módulo.
+    Se puede usar como @init_hook o @init_hook(cache=True).
+    """
+    def decorator(func):
+        hook = InitHook(func, cache)
+        _hooks.setdefault(hook.module, []).append(hook)
+        return hook
+    return decorator(func) if func is not None else decorator
+
+
+def run_init(module):
+    """
+    Ejecuta, en orden de declaración, los hooks pendientes de `module` (un
+    módulo o su nombre) y devuelve sus resultados.
+    """
+    name = module if isinstance(module, str) else module.__name__
+    return [hook() for hook in _hooks.get(name, [])]
+
+
+def finish_init(module_name):
+    """
+    Se llama al final del módulo: en modo 'eager' ejecuta sus hooks, en modo
+    'lazy' no hace nada.
+    """
+    if get_mode() == "eager":
+        run_init(module_name)
@@ -1,15 +1,38 @@
 import a
 import time
 
-r = a.f()
-print(r)
+import os
+import sys
 
-print(a.variable_de_a)
-a.variable_de_a = 6
-print(a.variable_de_a)
+# module_init.py está en others/resources/python/utils, junto a la raíz del repositorio
+path_utils = os.path.abspath(os.path.join(os.path.dirname(__file__), *[".."] * 3,
+                                          "others", "resources", "python", "utils"))
+if path_utils not in sys.path:
+    sys.path.append(path_utils)
 
+from module_init import init_hook, finish_init
+from hot_reload import ReloadManager
 
-while True:
-    print(4)
-    time.sleep(4)
-    print(5)
\ No newline at end of file
+# Con MODULE_INIT=lazy, importar b no ejecuta este bucle infinito
+@init_hook
+def bucle():
+    r = a.f()
+    print(r)
+
+    print(a.variable_de_a)
+    a.variable_de_a = 6
+    print(a.variable_de_a)
+
+    # Si se edita 'a.py' mientras el bucle corre, se recarga sin perder
+    # el valor de variable_de_a
+    recargador = ReloadManager()
+    recargador.watch(a, preserve=["variable_de_a"])
+
+    while True:
+        for nombre in recargador.check():
+            print("Recargado:", nombre)
+        print(4)
+        time.sleep(4)
+        print(5)
+
+finish_init(__name__)
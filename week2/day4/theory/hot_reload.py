@@ -0,0 +1,170 @@
+"""
+Recarga de módulos en caliente, sin reiniciar el proceso.
+
+importlib.reload vuelve a ejecutar el módulo y deja viejas las referencias que
+ya existían (por ejemplo `from a import f`), y además pierde el estado del
+módulo, como el valor de `a.variable_de_a` que cambia 'b.py'. ReloadManager:
+
+- vigila los ficheros de los módulos y solo recompila los que han cambiado,
+- sustituye el código de las funciones (y de los métodos de las clases) en
+  los objetos que ya existen, así que cualquier referencia anterior ejecuta
+  el código nuevo,
+- conserva las variables del módulo que se le indiquen.
+
+    recargador = ReloadManager()
+    recargador.watch(a, preserve=["variable_de_a"])
+    recargador.check()          # o recargador.start() para vigilar en un hilo
+
+El código a nivel de módulo se vuelve a ejecutar al recargar.
+"""
+import hashlib
+import inspect
+import sys
+import threading
+import traceback
+import types
+
+
+def _hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _update_function(old, new):
+    """
+    Copia el código de `new` en `old`. Devuelve False si no es posible (por
+    ejemplo si cambian las variables de un closure).
+    """
+    try:
+        old.__code__ = new.__code__
+    except ValueError:
+        return False
+    old.__defaults__ = new.__defaults__
+    old.__kwdefaults__ = new.__kwdefaults__
+    old.__doc__ = new.__doc__
+    old.__annotations__ = new.__annotations__
+    old.__dict__.update(new.__dict__)
+    return True
+
+
+def _update_class(old, new):
+    """Actualiza en la clase `old` los atributos definidos en `new`."""
+    for name, new_value in new.__dict__.items():
+        if name in ("__dict__", "__weakref__"):
+            continue
+        old_value = old.__dict__.get(name)
+        if isinstance(old_value, types.FunctionType) and \
+                isinstance(new_value, types.FunctionType) and \
+                _update_function(old_value, new_value):
+            continue
+        if isinstance(old_value, (staticmethod, classmethod)) and \
+                type(old_value) is type(new_value) and \
+                _update_function(old_value.__func__, new_value.__func__):
+            continue
+        try:
+            setattr(old, name, new_value)
+        except (AttributeError, TypeError):
+            pass
+
+
+class ReloadManager:
+    """
+    Vigila módulos y los recarga en caliente cuando cambia su código fuente.
+
+    Args:
+        interval ([float]): Segundos entre comprobaciones del hilo de `start`.
+    """
+
+    def __init__(self, interval=1.0):
+        self.interval = interval
+        self._watched = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def watch(self, module, preserve=()):
+        """
+        Empieza a vigilar `module` (un módulo o su nombre). Las variables de
+        `preserve` mantienen su valor actual al recargar.
+        """
+        if isinstance(module, str):
+            module = sys.modules[module]
+        path = inspect.getsourcefile(module)
+        self._watched[module.__name__] = {"module": module, "path": path,
+                                          "hash": _hash(path),
+                                          "preserve": set(preserve)}
+        return module
+
+    def check(self):
+        """
+        Recarga los módulos vigilados cuyo fichero ha cambiado desde la
+        última comprobación y devuelve sus nombres.
+        """
+        reloaded = []
+        with self._lock:
+            for name, info in self._watched.items():
+                try:
+                    new_hash = _hash(info["path"])
+                except OSError:
+                    continue
+                if new_hash != info["hash"]:
+                    info["hash"] = new_hash
+                    try:
+                        self._reload(info)
+                    except Exception:
+                        # Un error en el fichero editado no debe tumbar el
+                        # proceso: se avisa y se sigue con el código anterior
+                        traceback.print_exc()
+                        continue
+                    reloaded.append(name)
+        return reloaded
+
+    def _reload(self, info):
+        module = info["module"]
+        with open(info["path"], encoding="utf-8") as f:
+            code = compile(f.read(), info["path"], "exec")
+
+        # Como importlib.reload, el código nuevo se ejecuta en el propio
+        # módulo (las funciones nuevas ven sus variables globales). Después
+        # se vuelven a poner los objetos antiguos, actualizados.
+        old_namespace = dict(module.__dict__)
+        try:
+            exec(code, module.__dict__)
+        except BaseException:
+            module.__dict__.clear()
+            module.__dict__.update(old_namespace)
+            raise
+        for name, old_value in old_namespace.items():
+            new_value = module.__dict__.get(name)
+            if new_value is old_value:
+                continue
+            if name in info["preserve"]:
+                module.__dict__[name] = old_value
+            elif isinstance(old_value, types.FunctionType) and \
+                    isinstance(new_value, types.FunctionType) and \
+                    old_value.__module__ == module.__name__:
+                if _update_function(old_value, new_value):
+                    module.__dict__[name] = old_value
+            elif isinstance(old_value, type) and isinstance(new_value, type) and \
+                    old_value.__module__ == module.__name__:
+                _update_class(old_value, new_value)
+                module.__dict__[name] = old_value
+
+    def start(self):
+        """Comprueba los módulos cada `interval` segundos en un hilo aparte."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def stop(self):
+        """Para el hilo de `start`."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -1,2 +1,175 @@
-def print2(g):
-    print(g)
\ No newline at end of file
+"""
+print2 con salida por buffer.
+
+Escribir en la terminal en cada vuelta de un bucle cuesta más que el propio
+cálculo. print2 se usa igual que antes, pero guarda los textos en un buffer y
+los escribe de golpe:
+
+- cuando el buffer supera `max_records` textos o `max_chars` caracteres,
+- en la primera llamada que llega tras `interval` segundos sin escribir,
+- con salida.flush() y al terminar el programa.
+
+Por defecto no hay hilos: el buffer se escribe dentro de la propia llamada a
+print2 (o a salida.flush()). En Jupyter/IPython además se vacía al terminar
+cada celda, para que la salida no acabe en la celda siguiente. Para que un
+hilo escriba en segundo plano (y vacíe el buffer cada `interval` segundos
+aunque no se llame más a print2) se crea un OutputSink(background=True)
+propio o se llama a usar_hilo().
+
+Los mensajes de depuración (print2(..., level=DEBUG) o salida.debug(...)) se
+descartan sin formatearlos si el nivel de verbosidad es mayor que DEBUG. El
+nivel se elige con la variable de entorno PRINT2_LEVEL (por defecto INFO).
+Lo que va dentro de `if __debug__:` desaparece por completo con `python -O`.
+"""
+import atexit
+import os
+import queue
+import sys
+import threading
+import time
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+
+_LEVELS = {"DEBUG": DEBUG, "INFO": INFO, "WARNING": WARNING}
+
+
+def _ignore(*args, **kwargs):
+    pass
+
+
+class OutputSink:
+    """
+    Salida con buffer para sustituir a print en bucles.
+
+    Args:
+        stream ([file], optional): Destino. sys.stdout (el del momento de
+            escribir) si es None.
+        max_records ([int]): Textos guardados antes de escribir.
+        max_chars ([int]): Caracteres guardados antes de escribir.
+        interval ([float]): Segundos máximos que un texto espera en el buffer.
+        level ([int]): Nivel mínimo de los mensajes que se escriben.
+        background ([bool]): Si es True, un hilo escribe en `stream` y vacía
+            el buffer cada `interval` segundos aunque no se escriba nada más.
+    """
+
+    def __init__(self, stream=None, max_records=1000, max_chars=2**16, interval=0.5,
+                 level=INFO, background=False):
+        self.stream = stream
+        self.max_records = max_records
+        self.max_chars = max_chars
+        self.interval = interval
+        self._buffer = []
+        self._chars = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._queue = None
+        self._thread = None
+        self.set_level(level)
+        if background:
+            self._queue = queue.Queue()
+            self._thread = threading.Thread(target=self._writer, daemon=True)
+            self._thread.start()
+
+    def set_level(self, level):
+        """Cambia el nivel. Por debajo de él, debug() no hace nada."""
+        self.level = level
+        self.debug = self._debug if level <= DEBUG else _ignore
+
+    def _stream(self):
+        return self.stream if self.stream is not None else sys.stdout
+
+    def write(self, *values, sep=" ", end="\n", level=INFO):
+        """Guarda un texto formateado como lo haría print(*values, sep=sep, end=end)."""
+        if level < self.level:
+            return
+        text = sep.join(map(str, values)) + end
+        with self._lock:
+            self._buffer.append(text)
+            self._chars += len(text)
+            full = (len(self._buffer) >= self.max_records or self._chars >= self.max_chars)
+            due = self._thread is None and \
+                time.monotonic() - self._last_flush >= self.interval
+        if full or due:
+            self.flush()
+
+    def _debug(self, *values, sep=" ", end="\n"):
+        self.write(*values, sep=sep, end=end, level=DEBUG)
+
+    def _take(self):
+        with self._lock:
+            text = "".join(self._buffer)
+            self._buffer = []
+            self._chars = 0
+            self._last_flush = time.monotonic()
+        return text
+
+    def flush(self):
+        """Escribe lo que haya en el buffer."""
+        text = self._take()
+        if not text:
+            return
+        if self._thread is not None:
+            self._queue.put(text)
+        else:
+            stream = self._stream()
+            stream.write(text)
+            stream.flush()
+
+    def _writer(self):
+        while True:
+            try:
+                text = self._queue.get(timeout=self.interval)
+            except queue.Empty:
+                text = self._take()
+            if text is None:
+                return
+            if text:
+                stream = self._stream()
+                stream.write(text)
+                stream.flush()
+
+    def close(self):
+        """Escribe lo pendiente y, en modo background, para el hilo."""
+        self.flush()
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+salida = OutputSink(level=_LEVELS.get(os.environ.get("PRINT2_LEVEL", "INFO").upper(), INFO))
+
+
+@atexit.register
+def _cerrar_salida():
+    salida.close()
+
+
+def _vaciar_salida(*args):
+    salida.flush()
+
+
+try:
+    get_ipython().events.register("post_run_cell", _vaciar_salida)  # noqa: F821
+except NameError:
+    pass
+
+
+def usar_hilo(interval=0.5):
+    """Hace que print2 escriba desde un hilo en segundo plano."""
+    global salida
+    salida.close()
+    salida = OutputSink(max_records=salida.max_records, max_chars=salida.max_chars,
+                        interval=interval, level=salida.level, background=True)
+
+
+def print2(*values, sep=" ", end="\n", level=INFO):
+    salida.write(*values, sep=sep, end=end, level=level)
@@ -1,9 +1,352 @@
-import numpy as np
-import pandas as pd 
-import matplotlib.pyplot as plt
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 
-def grafica_verde(lista, ylabel):
-    plt.plot(lista, linewidth=2, 
-             marker='o', color="purple", linestyle='dashed', markersize=6)
+# lazy_import.py está en others/resources/python/utils, junto a la raíz del repositorio
+path_utils = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..",
+                                          "others", "resources", "python", "utils"))
+if path_utils not in sys.path:
+    sys.path.append(path_utils)
+
+from lazy_import import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+plt = lazy_import("matplotlib.pyplot")
+
+ESTILO_VERDE = dict(linewidth=2, marker='o', color="purple", linestyle='dashed', markersize=6)
+
+def grafica_verde(lista, ylabel, metodo="minmax", n_puntos=None):
+    """
+    Dibuja `lista` con el estilo de ESTILO_VERDE.
+
+    Si la serie tiene más puntos que píxeles de ancho tienen los ejes, se
+    reduce antes de dibujarla (ver `reducir`) y se dibuja sin marcadores.
+
+    Args:
+        lista ([list, np.array, pd.Series]): Valores a dibujar.
+        ylabel ([str]): Etiqueta del eje y.
+        metodo ([str]): "minmax", "lttb" o None para no reducir.
+        n_puntos ([int], optional): Puntos a los que se reduce. Por defecto el
+            ancho en píxeles de los ejes.
+    """
+    if metodo is None or len(lista) <= _ancho_reducido(plt.gca(), n_puntos):
+        plt.plot(lista, **ESTILO_VERDE)
+    else:
+        x, y = reducir(lista, _ancho_reducido(plt.gca(), n_puntos), metodo)
+        plt.plot(x, y, **dict(ESTILO_VERDE, marker=None))
     plt.ylabel(ylabel)
-    plt.show()
\ No newline at end of file
+    plt.show()
+
+
+# ---------------------------------------------------------------------------
+# Reducción de series largas antes de dibujarlas
+# ---------------------------------------------------------------------------
+
+def _ancho_reducido(ax, n_puntos=None):
+    if n_puntos is not None:
+        return n_puntos
+    return max(int(ax.get_window_extent().width), 3)
+
+def indices_minmax(y, n_cubos):
+    """
+    Índices del mínimo y del máximo de cada uno de `n_cubos` tramos iguales
+    de `y`, más el primero y el último. Dibujando solo esos puntos, cada
+    píxel de ancho conserva el rango vertical de la serie original.
+    """
+    y = np.asarray(y)
+    n = len(y)
+    tam = n // n_cubos if n_cubos > 0 else 0
+    if tam < 2:
+        return np.arange(n)
+    m = tam * n_cubos
+    bloques = y[:m].reshape(n_cubos, tam)
+    base = np.arange(n_cubos) * tam
+    imin = base + bloques.argmin(axis=1)
+    imax = base + bloques.argmax(axis=1)
+    if m < n:
+        # Los puntos que sobran se añaden al último tramo
+        resto = y[m:]
+        imin[-1] = min(imin[-1], m + resto.argmin(), key=lambda i: y[i])
+        imax[-1] = max(imax[-1], m + resto.argmax(), key=lambda i: y[i])
+    # Dentro de cada tramo los dos índices se ordenan para que x sea creciente
+    pares = np.empty((n_cubos, 2), dtype=np.intp)
+    pares[:, 0] = np.minimum(imin, imax)
+    pares[:, 1] = np.maximum(imin, imax)
+    return np.unique(np.concatenate(([0], pares.ravel(), [n - 1])))
+
+def indices_lttb(y, n_puntos, x=None):
+    """
+    Índices de los `n_puntos` elegidos por Largest-Triangle-Three-Buckets:
+    en cada tramo se queda el punto que forma el triángulo de mayor área con
+    el punto elegido en el tramo anterior y la media del tramo siguiente.
+
+    La elección de cada tramo depende de la anterior, así que se recorre
+    tramo a tramo, pero dentro de cada tramo el cálculo es vectorial.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_puntos >= n or n_puntos < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+
+    # n_puntos - 2 tramos entre el primer y el último punto
+    bordes = np.linspace(1, n - 1, n_puntos - 1).astype(np.intp)
+    tamanos = np.diff(bordes)
+    medias_x = np.add.reduceat(x[:n - 1], bordes[:-1]) / tamanos
+    medias_y = np.add.reduceat(y[:n - 1], bordes[:-1]) / tamanos
+    # La "media del tramo siguiente" del último tramo es el último punto
+    medias_x = np.append(medias_x[1:], x[-1])
+    medias_y = np.append(medias_y[1:], y[-1])
+
+    elegidos = np.empty(n_puntos, dtype=np.intp)
+    elegidos[0], elegidos[-1] = 0, n - 1
+    a = 0
+    for i in range(n_puntos - 2):
+        inicio, fin = bordes[i], bordes[i + 1]
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - medias_x[i]) * (y[inicio:fin] - ay) -
+                      (ax - x[inicio:fin]) * (medias_y[i] - ay))
+        a = inicio + area.argmax()
+        elegidos[i + 1] = a
+    return elegidos
+
+def reducir(lista, n_puntos, metodo="minmax", preseleccion=4):
+    """
+    Reduce una serie para dibujarla en `n_puntos` píxeles de ancho.
+
+    Args:
+        lista ([list, np.array, pd.Series]): Valores. Si tiene índice (una
+            Series), el índice se usa como x.
+        n_puntos ([int]): Ancho en píxeles. "minmax" devuelve hasta
+            2 * n_puntos + 2 puntos y "lttb" exactamente n_puntos.
+        metodo ([str]): "minmax" o "lttb".
+        preseleccion ([int]): Con "lttb", si la serie tiene más de
+            preseleccion * n_puntos puntos, antes se reduce con "minmax" a
+            ese tamaño (MinMaxLTTB), que da casi el mismo resultado y es
+            mucho más rápido con series enormes.
+
+    Returns:
+        [tuple]: Arrays x, y con los puntos elegidos.
+    """
+    y = np.asarray(lista)
+    if metodo == "minmax":
+        indices = indices_minmax(y, n_puntos)
+    elif metodo == "lttb":
+        if preseleccion and len(y) > preseleccion * n_puntos:
+            indices = indices_minmax(y, preseleccion * n_puntos // 2)
+            indices = indices[indices_lttb(y[indices], n_puntos, x=indices)]
+        else:
+            indices = indices_lttb(y, n_puntos)
+    else:
+        raise ValueError("metodo tiene que ser 'minmax' o 'lttb'")
+    x = np.asarray(lista.index)[indices] if hasattr(lista, "index") and \
+        not isinstance(lista, (list, tuple)) else indices
+    return x, y[indices]
+
+
+# ---------------------------------------------------------------------------
+# Gráficas en vivo
+# ---------------------------------------------------------------------------
+
+class GraficaEnVivo:
+    """
+    Gráfica que se actualiza con datos que van llegando, sin redibujar la
+    figura entera.
+
+    Guarda los últimos `capacidad` puntos de cada línea en un buffer circular
+    reservado desde el principio: añadir k puntos cuesta O(k) y no crea
+    arrays nuevos. Al dibujar solo se repintan las líneas sobre el fondo
+    guardado de los ejes (blitting). El fondo (ejes, etiquetas, rejilla) solo
+    se vuelve a dibujar cuando los datos se salen del eje y.
+
+        viva = GraficaEnVivo(capacidad=500, ylabel="temperatura")
+        while True:
+            viva.anadir(leer_sensor())
+            viva.dibujar()
+
+    Args:
+        capacidad ([int]): Puntos que se muestran de cada línea.
+        n_lineas ([int]): Número de líneas.
+        ax ([matplotlib.axes.Axes], optional): Ejes donde dibujar. Por defecto
+            unos nuevos en una figura nueva. Varias gráficas en vivo pueden
+            compartir figura usando ejes distintos.
+        ylabel ([str], optional): Etiqueta del eje y.
+        ylim ([tuple], optional): Límites iniciales del eje y. Por defecto se
+            ajustan a los primeros datos.
+        estilo ([dict], optional): Argumentos de estilo de las líneas. Por
+            defecto ESTILO_VERDE sin marcadores.
+    """
+
+    def __init__(self, capacidad=1000, n_lineas=1, ax=None, ylabel=None, ylim=None,
+                 estilo=None):
+        if ax is None:
+            _, ax = plt.subplots()
+        self.ax = ax
+        self.capacidad = capacidad
+        self.n_lineas = n_lineas
+        # Cada valor se escribe dos veces, en i y en i + capacidad: así los
+        # últimos `capacidad` puntos siempre son un trozo contiguo y ordenado
+        # del buffer y se pueden dibujar sin copiarlos
+        self._datos = np.full((n_lineas, 2 * capacidad), np.nan)
+        self._x = np.arange(capacidad)
+        self._n = 0
+        self._fondo = None
+        self._reescalar = ylim is None
+        estilo = dict(ESTILO_VERDE, marker=None) if estilo is None else estilo
+        self.lineas = [ax.plot([], [], animated=True, **estilo)[0] for _ in range(n_lineas)]
+        ax.set_xlim(0, capacidad - 1)
+        if ylim is not None:
+            ax.set_ylim(*ylim)
+        if ylabel is not None:
+            ax.set_ylabel(ylabel)
+        self._cid = ax.figure.canvas.mpl_connect("draw_event", self._al_dibujar)
+
+    def anadir(self, valores):
+        """
+        Añade puntos. Con una línea, `valores` es un número o un array de k
+        valores; con varias, un array de forma (n_lineas,) o (n_lineas, k).
+        """
+        valores = np.asarray(valores, dtype=float).reshape(self.n_lineas, -1)
+        k = valores.shape[1]
+        if k > self.capacidad:
+            # Los que no caben se sobrescribirían igualmente
+            self._n += k - self.capacidad
+            valores = valores[:, -self.capacidad:]
+            k = self.capacidad
+        posiciones = (self._n + np.arange(k)) % self.capacidad
+        self._datos[:, posiciones] = valores
+        self._datos[:, posiciones + self.capacidad] = valores
+        self._n += k
+
+        if not self._reescalar and np.isfinite(valores).any():
+            abajo, arriba = self.ax.get_ylim()
+            if np.nanmin(valores) < abajo or np.nanmax(valores) > arriba:
+                self._reescalar = True
+
+    def datos(self):
+        """Array (n_lineas, n) con los puntos visibles, del más antiguo al más nuevo."""
+        if self._n < self.capacidad:
+            return self._datos[:, :self._n]
+        inicio = self._n % self.capacidad
+        return self._datos[:, inicio:inicio + self.capacidad]
+
+    def _ajustar_ylim(self):
+        datos = self.datos()
+        if not np.isfinite(datos).any():
+            return
+        abajo, arriba = np.nanmin(datos), np.nanmax(datos)
+        margen = 0.1 * (arriba - abajo) or 0.5
+        self.ax.set_ylim(abajo - margen, arriba + margen)
+
+    def _pintar_lineas(self):
+        datos = self.datos()
+        x = self._x[:datos.shape[1]]
+        for linea, y in zip(self.lineas, datos):
+            linea.set_data(x, y)
+            self.ax.draw_artist(linea)
+
+    def _al_dibujar(self, evento):
+        # Tras un dibujado completo se guarda el fondo sin las líneas
+        self._fondo = evento.canvas.copy_from_bbox(self.ax.bbox)
+        self._pintar_lineas()
+
+    def dibujar(self):
+        """Repinta las líneas. Solo redibuja la figura entera si hace falta."""
+        canvas = self.ax.figure.canvas
+        if self._reescalar:
+            self._ajustar_ylim()
+            self._reescalar = False
+            self._fondo = None
+        if self._fondo is None or not canvas.supports_blit:
+            canvas.draw()
+        else:
+            canvas.restore_region(self._fondo)
+            self._pintar_lineas()
+            canvas.blit(self.ax.bbox)
+        canvas.flush_events()
+
+    def cerrar(self):
+        """Deja de escuchar los eventos de dibujado de la figura."""
+        self.ax.figure.canvas.mpl_disconnect(self._cid)
+
+
+# ---------------------------------------------------------------------------
+# Renderizado por lotes, sin pantalla
+# ---------------------------------------------------------------------------
+
+# Cada proceso crea una sola figura y la reutiliza para todas sus gráficas
+_figura = None
+_metodo = None
+
+def _iniciar_trabajador(figsize, dpi, metodo="minmax"):
+    global _figura, _metodo
+    # Figure + FigureCanvasAgg no necesitan pyplot ni pantalla
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    _figura = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(_figura)
+    ax = _figura.add_subplot()
+    ax.plot([], [], **ESTILO_VERDE)
+    _metodo = metodo
+
+def _dibujar(trabajo):
+    lista, ylabel, ruta = trabajo
+    ax = _figura.axes[0]
+    linea = ax.lines[0]
+    y = np.asarray(lista, dtype=float)
+    n_puntos = _ancho_reducido(ax)
+    # Se cambian los datos de la línea existente en lugar de crear otra
+    if _metodo is None or len(y) <= n_puntos:
+        linea.set_data(np.arange(len(y)), y)
+        linea.set_marker(ESTILO_VERDE["marker"])
+    else:
+        linea.set_data(*reducir(y, n_puntos, _metodo))
+        linea.set_marker("")
+    ax.relim()
+    ax.autoscale_view()
+    ax.set_ylabel(ylabel)
+    _figura.savefig(ruta)
+    return ruta
+
+def grafica_verde_lote(trabajos, carpeta, formato="png", nombres=None, n_procesos=None,
+                       figsize=(6.4, 4.8), dpi=100, chunksize=16, metodo="minmax"):
+    """
+    Guarda en ficheros una gráfica como las de grafica_verde por cada trabajo,
+    repartiendo el trabajo entre varios procesos y sin abrir ventanas.
+
+    Args:
+        trabajos ([iterable]): Pares (lista, ylabel).
+        carpeta ([str]): Carpeta donde se guardan las imágenes (se crea si no existe).
+        formato ([str]): "png" o "svg".
+        nombres ([iterable], optional): Nombres de los ficheros sin extensión.
+            Por defecto "grafica_0", "grafica_1", ...
+        n_procesos ([int], optional): Procesos a usar. Por defecto uno por CPU;
+            con 1 se dibuja en el propio proceso.
+        figsize ([tuple]): Tamaño de la figura en pulgadas.
+        dpi ([int]): Resolución de los PNG.
+        chunksize ([int]): Trabajos que se envían juntos a cada proceso.
+        metodo ([str]): Reducción de las series largas, como en grafica_verde.
+
+    Returns:
+        [list]: Rutas de las imágenes, en el orden de `trabajos`.
+    """
+    if formato not in ("png", "svg"):
+        raise ValueError("formato tiene que ser 'png' o 'svg'")
+    os.makedirs(carpeta, exist_ok=True)
+    trabajos = list(trabajos)
+    if nombres is None:
+        nombres = ["grafica_{}".format(i) for i in range(len(trabajos))]
+    nombres = list(nombres)
+    if len(nombres) != len(trabajos):
+        raise ValueError("Hay {} nombres para {} trabajos".format(len(nombres), len(trabajos)))
+    rutas = [os.path.join(carpeta, "{}.{}".format(nombre, formato)) for nombre in nombres]
+    tareas = [(lista, ylabel, ruta) for (lista, ylabel), ruta in zip(trabajos, rutas)]
+
+    if n_procesos == 1:
+        _iniciar_trabajador(figsize, dpi, metodo)
+        return [_dibujar(tarea) for tarea in tareas]
+    with ProcessPoolExecutor(n_procesos, initializer=_iniciar_trabajador,
+                             initargs=(figsize, dpi, metodo)) as pool:
+        return list(pool.map(_dibujar, tareas, chunksize=chunksize))
@@ -0,0 +1,185 @@
+"""
+Gaussian Naive Bayes built on the p_x_given_y of '5.BayesClassification.ipynb'.
+
+Instead of extracting every mean and variance by hand and calling p_x_given_y
+once per feature, the classifier keeps (n_classes x n_features) matrices of
+means and variances and scores a whole batch of rows at once:
+
+    model = GaussianNaiveBayes().fit(data[['Height', 'Weight', 'Foot_Size']],
+                                     data['Gender'])
+    model.predict(person)
+
+The per-class statistics can also be updated chunk by chunk with
+`partial_fit`, and models trained on different shards combined with `merge`.
+"""
+from collections.abc import Iterator
+
+import numpy as np
+
+
+def p_x_given_y(x, mean_y, variance_y):
+    """Gaussian density of `x` for a class with `mean_y` and `variance_y`."""
+    # Input the arguments into a probability density function
+    p = 1/(np.sqrt(2*np.pi*variance_y)) * np.exp((-(x-mean_y)**2)/(2*variance_y))
+    return p
+
+
+def log_p_x_given_y(x, mean_y, variance_y):
+    """Logarithm of p_x_given_y, without underflow for far away values."""
+    return -0.5 * (np.log(2*np.pi*variance_y) + (x-mean_y)**2/variance_y)
+
+
+def _logsumexp(a, axis):
+    a_max = a.max(axis=axis, keepdims=True)
+    return a_max + np.log(np.exp(a - a_max).sum(axis=axis, keepdims=True))
+
+
+class GaussianNaiveBayes:
+    """
+    Naive Bayes classifier with a Gaussian likelihood for every feature.
+
+    Args:
+        var_smoothing ([float]): Fraction of the largest feature variance added
+            to every variance, so that constant features do not divide by 0.
+        chunksize ([int]): Number of rows scored at a time. Bounds the memory of
+            the (rows x classes x features) intermediate array.
+    """
+
+    def __init__(self, var_smoothing=1e-9, chunksize=100000):
+        self.var_smoothing = var_smoothing
+        self.chunksize = chunksize
+
+    def fit(self, X, y):
+        """
+        Compute the prior, means and variances of every class.
+
+        Variances use ddof=1, like data.groupby('Gender').var() in the notebook.
+        """
+        self.classes_ = None
+        return self.partial_fit(X, y)
+
+    def partial_fit(self, X, y):
+        """
+        Update the model with a new chunk of rows, without revisiting the old
+        ones.
+
+        Every class keeps its count, mean and M2 (sum of squared deviations
+        from the mean). The statistics of the chunk are computed in one pass
+        and combined with the stored ones with the pairwise form of Welford's
+        update, so fitting chunk by chunk gives the same model as `fit` on
+        all the rows.
+        """
+        X = np.asarray(X, dtype=float)
+        classes, y_codes = np.unique(np.asarray(y), return_inverse=True)
+        one_hot = np.zeros((len(classes), len(X)))
+        one_hot[y_codes, np.arange(len(X))] = 1
+        counts = one_hot.sum(axis=1)
+        means = one_hot @ X / counts[:, None]
+        m2 = one_hot @ (X - means[y_codes])**2
+        return self._combine(classes, counts, means, m2)
+
+    def merge(self, other):
+        """
+        Add the statistics of `other`, a model fitted on different rows (e.g.
+        in another process). The result is the model fitted on both sets.
+        """
+        return self._combine(other.classes_, other.counts_, other.means_, other.m2_)
+
+    def _combine(self, classes, counts, means, m2):
+        if getattr(self, "classes_", None) is None:
+            self.classes_ = np.asarray(classes)
+            self.counts_ = np.zeros(len(classes))
+            self.means_ = np.zeros_like(means)
+            self.m2_ = np.zeros_like(m2)
+        new = np.setdiff1d(classes, self.classes_)
+        if len(new):
+            all_classes = np.union1d(self.classes_, new)
+            old = np.searchsorted(all_classes, self.classes_)
+            self.counts_, self.means_, self.m2_ = [
+                self._expand(values, old, len(all_classes))
+                for values in (self.counts_, self.means_, self.m2_)]
+            self.classes_ = all_classes
+
+        k = np.searchsorted(self.classes_, classes)
+        n_a, n_b = self.counts_[k], np.asarray(counts, dtype=float)
+        n = n_a + n_b
+        delta = means - self.means_[k]
+        self.means_[k] += delta * (n_b / n)[:, None]
+        self.m2_[k] += m2 + delta**2 * (n_a * n_b / n)[:, None]
+        self.counts_[k] = n
+        return self
+
+    @staticmethod
+    def _expand(values, positions, size):
+        expanded = np.zeros((size,) + values.shape[1:])
+        expanded[positions] = values
+        return expanded
+
+    @property
+    def variances_(self):
+        # A class seen only once has no sample variance (0/0 with ddof=1):
+        # it gets variance 0, and _log_params adds the smoothing term
+        seen_twice = (self.counts_ > 1)[:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(seen_twice, self.m2_ / (self.counts_ - 1)[:, None], 0.0)
+
+    @property
+    def priors_(self):
+        return self.counts_ / self.counts_.sum()
+
+    def _log_params(self):
+        variances = self.variances_
+        epsilon = self.var_smoothing * variances.max()
+        # If every variance is 0 (e.g. one row per class) smooth with an
+        # absolute var_smoothing instead of dividing by 0
+        variances = variances + (epsilon if epsilon > 0 else self.var_smoothing)
+        return np.log(self.priors_), self.means_, variances
+
+    def _joint_log_likelihood(self, X, log_priors, means, variances):
+        # (rows, 1, features) against (classes, features) -> (rows, classes)
+        log_p = log_p_x_given_y(X[:, None, :], means, variances)
+        return log_priors + log_p.sum(axis=2)
+
+    def _chunks(self, X):
+        if isinstance(X, Iterator):
+            # A stream of batches, e.g. a generator or
+            # pd.read_csv(..., chunksize=...)
+            for chunk in X:
+                yield from self._chunks(chunk)
+            return
+        # One batch: DataFrame, array, list of rows, or a single row (list,
+        # tuple, Series...)
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X[None, :]
+        for start in range(0, len(X), self.chunksize):
+            yield X[start:start + self.chunksize]
+
+    def predict_log_proba(self, X):
+        """
+        Log posterior probability of every class for every row of `X`.
+
+        Args:
+            X ([np.ndarray, pd.DataFrame, list or iterator]): (n_samples x
+                n_features) batch, a single row, or an iterator (generator,
+                chunked reader...) of batches.
+
+        Returns:
+            [np.ndarray]: (n_samples x n_classes) array of log probabilities.
+        """
+        params = self._log_params()
+        results = []
+        for chunk in self._chunks(X):
+            joint = self._joint_log_likelihood(chunk, *params)
+            results.append(joint - _logsumexp(joint, axis=1))
+        if not results:
+            return np.empty((0, len(self.classes_)))
+        return np.concatenate(results)
+
+    def predict_proba(self, X):
+        """Posterior probability of every class for every row of `X`."""
+        return np.exp(self.predict_log_proba(X))
+
+    def predict(self, X):
+        """Most probable class of every row of `X`."""
+        return self.classes_[self.predict_log_proba(X).argmax(axis=1)]
@@ -0,0 +1,72 @@
+"""
+Vectorized bootstrap of sampling distributions.
+
+'1.Sampling Distributions.ipynb' builds the sampling distribution of the mean
+with a Python loop:
+
+    for _ in range(100000):
+        sample_props20.append(np.random.choice(students, 20).mean())
+
+Here the replicates are drawn in blocks, as a (replicates x sample_size)
+matrix of indices that fits in `max_memory` bytes, and every block is reduced
+with a single call of the statistic:
+
+    result = bootstrap(students, sample_size=20, n_replicates=10**6, rng=42)
+    result["std_error"], result["ci"]
+"""
+import numpy as np
+
+
+def bootstrap(data, sample_size=None, n_replicates=10000, statistic=np.mean, rng=None,
+              level=0.95, max_memory=2**27, uniforms=None):
+    """
+    Sampling distribution of `statistic` over samples drawn with replacement
+    from `data`.
+
+    Args:
+        data ([array-like]): Values to resample.
+        sample_size ([int], optional): Size of every sample. len(data) when None.
+        n_replicates ([int]): Number of samples.
+        statistic ([callable]): Vectorized reducer called as
+            statistic(samples, axis=1) on a (block x sample_size) array, e.g.
+            np.mean, np.median, np.std or any function with that signature.
+        rng ([int or np.random.Generator], optional): Seed or generator.
+        level ([float]): Confidence level of the percentile interval.
+        max_memory ([int]): Maximum bytes of the block of indices and values.
+        uniforms ([callable], optional): Function uniforms(n, d, rng) used to
+            draw the indices, e.g. variance_reduction.make_uniforms("sobol").
+            Plain integer draws when None.
+
+    Returns:
+        [dict]: 'distribution' (one statistic per replicate), 'mean',
+            'std_error' (standard deviation of the distribution) and 'ci'
+            (percentile confidence interval).
+    """
+    if not isinstance(rng, np.random.Generator):
+        rng = np.random.default_rng(rng)
+    data = np.asarray(data)
+    sample_size = len(data) if sample_size is None else sample_size
+    bytes_per_replicate = sample_size * (np.dtype(np.int64).itemsize + data.itemsize)
+    if uniforms is not None:
+        bytes_per_replicate += sample_size * np.dtype(float).itemsize
+    block = max(1, min(n_replicates, max_memory // bytes_per_replicate))
+    if getattr(uniforms, "power_of_two", False):
+        # Sobol points keep their balance only in blocks of 2**m replicates
+        block = 1 << (block.bit_length() - 1)
+
+    distribution = np.empty(n_replicates)
+    for start in range(0, n_replicates, block):
+        n = min(block, n_replicates - start)
+        if uniforms is None:
+            indices = rng.integers(0, len(data), size=(n, sample_size))
+        else:
+            indices = np.minimum(uniforms(n, sample_size, rng) * len(data),
+                                 len(data) - 1).astype(np.int64)
+        samples = data[indices]
+        distribution[start:start + n] = statistic(samples, axis=1)
+
+    alpha = (1 - level) / 2
+    return {"distribution": distribution,
+            "mean": distribution.mean(),
+            "std_error": distribution.std(ddof=1),
+            "ci": tuple(float(q) for q in np.quantile(distribution, [alpha, 1 - alpha]))}
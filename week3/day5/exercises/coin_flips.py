@@ -0,0 +1,238 @@
+"""
+Bit-packed coin flips.
+
+'3.Simulating_coin_flips.ipynb' uses np.random.randint(2, size=10000), which
+stores every flip in an 8-byte integer. Here the flips are the bits of the raw
+64-bit words of the bit generator (1 = heads), so every word is 64 flips:
+
+    stats = simulate_flips(10**9, rng=42)
+    stats.proportion, stats.longest_heads, stats.longest_tails
+
+FlipStats can be merged in order, so simulate_flips also works as a
+simulation for montecarlo.run_simulation.
+"""
+import numpy as np
+
+# Number of set bits of every byte, for numpy versions without bitwise_count
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount(words):
+    """Total number of set bits of an array of uint64 words."""
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(words).sum(dtype=np.int64))
+    return int(_POPCOUNT_TABLE[words.view(np.uint8)].sum(dtype=np.int64))
+
+
+def flip_words(n_words, rng=None):
+    """`n_words` raw uint64 words of the generator, 64 fair flips each."""
+    if not isinstance(rng, np.random.Generator):
+        rng = np.random.default_rng(rng)
+    return rng.bit_generator.random_raw(n_words)
+
+
+def pack_flips(bits):
+    """Pack an array of 0/1 flips into uint64 words (inverse of unpack_flips)."""
+    n_words = -(-len(bits) // 64)
+    packed = np.zeros(n_words * 8, dtype=np.uint8)
+    packed[:-(-len(bits) // 8)] = np.packbits(bits, bitorder="little")
+    return packed.view("<u8")
+
+
+def unpack_flips(words, n_flips=None):
+    """Flips of `words` as a uint8 array of 0 and 1, truncated to `n_flips`."""
+    bits = np.unpackbits(np.ascontiguousarray(words, dtype="<u8").view(np.uint8),
+                         bitorder="little")
+    return bits if n_flips is None else bits[:n_flips]
+
+
+def _bit_counts(words):
+    """Number of set bits of every uint64 word."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).astype(np.int64)
+    return _POPCOUNT_TABLE[words.view(np.uint8)].reshape(-1, 8).sum(axis=1, dtype=np.int64)
+
+
+def _low_run(words):
+    """Length of the run of set bits that starts at bit 0 (the first flip)."""
+    zeros = ~words
+    lowest_zero = zeros & (~zeros + np.uint64(1))
+    # All the bits below the lowest zero; all 64 if there is no zero
+    return _bit_counts(lowest_zero - np.uint64(1))
+
+
+def _high_run(words):
+    """Length of the run of set bits that ends at bit 63 (the last flip)."""
+    zeros = ~words
+    for shift in (1, 2, 4, 8, 16, 32):
+        zeros |= zeros >> np.uint64(shift)
+    return 64 - _bit_counts(zeros)
+
+
+def _longest_in_word(words):
+    """Longest run of set bits inside any single word."""
+    # After k steps of x &= x >> 1 a bit survives if it starts k + 1 set bits.
+    # Words without such runs are dropped, so each step is cheaper.
+    x = words[words != 0]
+    longest = 0
+    while len(x):
+        longest += 1
+        x = x & (x >> np.uint64(1))
+        x = x[x != 0]
+    return longest
+
+
+def _runs_of_ones(words):
+    """
+    Longest run of set bits across consecutive words, and the length of the
+    runs at the very start and the very end of the sequence.
+    """
+    m = len(words)
+    not_full = np.flatnonzero(words != np.uint64(2**64 - 1))
+    if len(not_full) == 0:
+        return 64 * m, 64 * m, 64 * m
+    low, high = _low_run(words[not_full]), _high_run(words[not_full])
+    # A run that crosses words ends a non-full word, goes through the full
+    # words in between and starts the next non-full word
+    crossing = high[:-1] + 64 * (np.diff(not_full) - 1) + low[1:]
+    first = 64 * int(not_full[0]) + int(low[0])
+    last = int(high[-1]) + 64 * (m - 1 - int(not_full[-1]))
+    longest = max(_longest_in_word(words), first, last,
+                  int(crossing.max()) if len(crossing) else 0)
+    return longest, first, last
+
+
+class FlipStats:
+    """
+    Count, heads and longest runs of a sequence of flips.
+
+    It also keeps the first and the last run of the sequence so that the
+    stats of consecutive chunks can be merged exactly, including the runs
+    that cross the boundary between two chunks.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.heads = 0
+        self.longest = [0, 0]  # [tails, heads]
+        self.first_value = self.last_value = None
+        self.first_run = self.last_run = 0
+
+    @classmethod
+    def from_words(cls, words, n_flips=None):
+        """
+        Stats of the flips stored in the uint64 `words`.
+
+        The runs are found on the words themselves (bit counts and shifts),
+        without unpacking one byte per flip. Only the bits of a last,
+        partially used word are unpacked.
+        """
+        words = np.ascontiguousarray(words, dtype=np.uint64)
+        n_flips = len(words) * 64 if n_flips is None else n_flips
+        full, rest = divmod(n_flips, 64)
+        stats = cls._from_full_words(words[:full])
+        if rest:
+            stats = stats.merge(cls._from_bits(unpack_flips(words[full:full + 1], rest)))
+        return stats
+
+    @classmethod
+    def _from_full_words(cls, words):
+        stats = cls()
+        if len(words) == 0:
+            return stats
+        stats.n = len(words) * 64
+        stats.heads = popcount(words)
+        for value, bits in ((1, words), (0, ~words)):
+            stats.longest[value], first_run, last_run = _runs_of_ones(bits)
+            if first_run:
+                stats.first_value, stats.first_run = value, first_run
+            if last_run:
+                stats.last_value, stats.last_run = value, last_run
+        return stats
+
+    @classmethod
+    def _from_bits(cls, bits):
+        """Stats of an array of 0/1 flips, one per element."""
+        stats = cls()
+        stats.n = len(bits)
+        stats.heads = int(bits.sum(dtype=np.int64))
+        starts = np.concatenate(([0], np.flatnonzero(bits[1:] != bits[:-1]) + 1))
+        lengths = np.diff(np.append(starts, len(bits)))
+        values = bits[starts]
+        for value in (0, 1):
+            runs = lengths[values == value]
+            stats.longest[value] = int(runs.max()) if len(runs) else 0
+        stats.first_value, stats.first_run = int(values[0]), int(lengths[0])
+        stats.last_value, stats.last_run = int(values[-1]), int(lengths[-1])
+        return stats
+
+    def merge(self, other):
+        """Stats of the flips of `self` followed by the flips of `other`."""
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            return other
+        merged = FlipStats()
+        merged.n = self.n + other.n
+        merged.heads = self.heads + other.heads
+        merged.longest = [max(a, b) for a, b in zip(self.longest, other.longest)]
+        merged.first_value, merged.first_run = self.first_value, self.first_run
+        merged.last_value, merged.last_run = other.last_value, other.last_run
+        if self.last_value == other.first_value:
+            joined = self.last_run + other.first_run
+            merged.longest[self.last_value] = max(merged.longest[self.last_value], joined)
+            if self.first_run == self.n:
+                merged.first_run = joined
+            if other.last_run == other.n:
+                merged.last_run = joined
+        return merged
+
+    @property
+    def tails(self):
+        return self.n - self.heads
+
+    @property
+    def proportion(self):
+        """Proportion of heads."""
+        return self.heads / self.n if self.n else float("nan")
+
+    @property
+    def longest_heads(self):
+        return self.longest[1]
+
+    @property
+    def longest_tails(self):
+        return self.longest[0]
+
+    def __repr__(self):
+        return ("FlipStats(n={}, heads={}, longest_heads={}, longest_tails={})"
+                .format(self.n, self.heads, self.longest_heads, self.longest_tails))
+
+
+def simulate_flips(n_flips, rng=None, chunk_words=2**16, uniforms=None):
+    """
+    Flip a fair coin `n_flips` times, `chunk_words` * 64 flips at a time, and
+    return their FlipStats. Memory only depends on `chunk_words`.
+
+    With `uniforms`, a function uniforms(n, d, rng) such as
+    variance_reduction.make_uniforms("stratified"), every flip is u < 0.5
+    instead of a raw bit. That reduces the variance of the proportion, but
+    the flips are no longer independent, so the streaks are only meaningful
+    with variance_reduction.random_uniforms.
+    """
+    if not isinstance(rng, np.random.Generator):
+        rng = np.random.default_rng(rng)
+    if getattr(uniforms, "power_of_two", False):
+        # Sobol points keep their balance only in blocks of 2**m flips
+        chunk_words = 1 << (chunk_words.bit_length() - 1)
+    stats = FlipStats()
+    remaining = n_flips
+    while remaining > 0:
+        n = min(remaining, chunk_words * 64)
+        if uniforms is None:
+            words = flip_words(-(-n // 64), rng)
+        else:
+            words = pack_flips(uniforms(n, 1, rng)[:, 0] < 0.5)
+        stats = stats.merge(FlipStats.from_words(words, n))
+        remaining -= n
+    return stats
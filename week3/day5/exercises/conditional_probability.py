@@ -0,0 +1,100 @@
+"""
+Conditional probabilities and Bayes rule from a cached contingency cube.
+
+'4.Conditional_probability_bayes_rule.ipynb' groups 'cancer_test_data.csv'
+and then types the counts by hand, e.g. print(277/(277+531)). Here the joint
+counts are built once and every query is answered from them:
+
+    probs = ConditionalProbability(df, ['has_cancer', 'test_result'])
+    probs.probability({'has_cancer': True}, given={'test_result': 'Positive'})
+    probs.likelihood_ratio({'test_result': 'Positive'}, {'has_cancer': True})
+    probs.update(new_rows)
+"""
+import numpy as np
+
+from contingency import DataCube
+
+
+class ConditionalProbability:
+    """
+    Probability queries over the categorical `columns` of `df`.
+
+    Conditions are dicts of `column: value`. Answers are cached until new
+    rows are added with `update`.
+    """
+
+    def __init__(self, df, columns):
+        self.cube = DataCube(df, columns)
+        self._cache = {}
+
+    @classmethod
+    def from_chunks(cls, chunks, columns):
+        """
+        Build the engine from an iterable of DataFrames, e.g. the output of
+        pd.read_csv(path, chunksize=...), without loading all the rows.
+        """
+        chunks = iter(chunks)
+        engine = cls(next(chunks), columns)
+        for chunk in chunks:
+            engine.update(chunk)
+        return engine
+
+    def update(self, df):
+        """Add the rows of `df` to the joint counts."""
+        self.cube.update(df)
+        self._cache.clear()
+
+    def _cached(self, name, *conditions):
+        key = (name,) + tuple(frozenset(c.items()) for c in conditions)
+        if key not in self._cache:
+            self._cache[key] = getattr(self, "_" + name)(*conditions)
+        return self._cache[key]
+
+    def count(self, conditions=None):
+        """Number of rows matching `conditions`."""
+        return self.cube.count(conditions)
+
+    def probability(self, event, given=None):
+        """P(event | given), or P(event) when `given` is None."""
+        return self._cached("probability", event, given or {})
+
+    def _probability(self, event, given):
+        return self.cube.rate(event, given)
+
+    def likelihood(self, evidence, hypothesis):
+        """P(evidence | hypothesis)."""
+        return self.probability(evidence, hypothesis)
+
+    def posterior(self, hypothesis, evidence):
+        """
+        P(hypothesis | evidence) computed with Bayes rule:
+
+            P(H | E) = P(E | H) * P(H) / P(E)
+        """
+        return self._cached("posterior", hypothesis, evidence)
+
+    def _posterior(self, hypothesis, evidence):
+        p_evidence = self.probability(evidence)
+        if p_evidence == 0 or np.isnan(p_evidence):
+            return np.nan
+        return (self.likelihood(evidence, hypothesis) * self.probability(hypothesis)
+                / p_evidence)
+
+    def likelihood_ratio(self, evidence, hypothesis):
+        """
+        P(evidence | hypothesis) / P(evidence | not hypothesis).
+
+        For a diagnostic test this is the positive likelihood ratio when the
+        evidence is a positive result and the hypothesis having the disease.
+        """
+        return self._cached("likelihood_ratio", evidence, hypothesis)
+
+    def _likelihood_ratio(self, evidence, hypothesis):
+        n_hypothesis = self.count(hypothesis)
+        n_other = self.count() - n_hypothesis
+        if n_hypothesis == 0 or n_other == 0:
+            return np.nan
+        n_evidence_other = self.count(evidence) - self.count({**hypothesis, **evidence})
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.float64(self.likelihood(evidence, hypothesis)) / (n_evidence_other
+                                                                        / n_other)
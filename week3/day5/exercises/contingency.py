@@ -0,0 +1,204 @@
+"""
+Contingency cubes for categorical EDA.
+
+A DataCube counts every combination of a few categorical columns in a single
+pass over the DataFrame. Counts, proportions and rates are then read from the
+cube instead of filtering the whole DataFrame again, e.g. the admission rates
+of '2.Simpsons_paradox.ipynb':
+
+    cube = DataCube(df, ['gender', 'major', 'admitted'])
+    cube.count(gender='female', major='Physics')
+    cube.rate({'admitted': True}, given={'gender': 'female', 'major': 'Physics'})
+    cube.rates({'admitted': True}, by=['major', 'gender'])
+"""
+import numpy as np
+import pandas as pd
+
+
+def encode_columns(df, columns):
+    """
+    Dictionary-encode `columns` of `df` in a single pass per column.
+
+    Args:
+        df ([pd.DataFrame]): Data to encode.
+        columns ([list]): Columns to encode.
+
+    Returns:
+        [tuple]: (codes, levels). `codes` is a list with one integer array per
+            column (-1 for missing values) and `levels` a dict with the sorted
+            distinct values of every column.
+    """
+    codes = []
+    levels = {}
+    for col in columns:
+        col_codes, uniques = pd.factorize(df[col], sort=True)
+        codes.append(col_codes)
+        levels[col] = list(uniques)
+    return codes, levels
+
+
+class DataCube:
+    """
+    Counts of every combination of the levels of `columns`.
+
+    Args:
+        df ([pd.DataFrame]): Data to count. Rows with missing values in any
+            of the selected columns are ignored.
+        columns ([list]): Categorical columns of the cube.
+
+    The levels of every column are sorted when the cube is built; levels that
+    only appear in later calls to `update` are appended after them.
+    """
+
+    def __init__(self, df, columns):
+        self.columns = list(columns)
+        if not self.columns:
+            raise ValueError("DataCube needs at least one column")
+        self.levels = {col: [] for col in self.columns}
+        self.cube = np.zeros((0,) * len(self.columns), dtype=np.int64)
+        self._axis = {col: i for i, col in enumerate(self.columns)}
+        self._position = {col: {} for col in self.columns}
+        self._marginals = {}
+        self.update(df)
+
+    def update(self, df):
+        """
+        Add the rows of `df` to the counts.
+
+        Values not seen before are appended to the levels of their column.
+        Cached marginals are updated with the counts of the new rows instead
+        of being recomputed from the cube.
+        """
+        codes, chunk_levels = encode_columns(df, self.columns)
+        for i, col in enumerate(self.columns):
+            levels, positions = self.levels[col], self._position[col]
+            for value in chunk_levels[col]:
+                if value not in positions:
+                    positions[value] = len(levels)
+                    levels.append(value)
+            # The trailing -1 keeps missing values (code -1) as -1
+            lookup = np.array([positions[value] for value in chunk_levels[col]] + [-1],
+                              dtype=np.int64)
+            codes[i] = lookup[codes[i]]
+        shape = tuple(len(self.levels[col]) for col in self.columns)
+        if shape != self.cube.shape:
+            self.cube = np.pad(self.cube, [(0, new - old) for new, old
+                                           in zip(shape, self.cube.shape)])
+            self._marginals = {}
+
+        valid = np.logical_and.reduce([col_codes >= 0 for col_codes in codes])
+        if not valid.all():
+            codes = [col_codes[valid] for col_codes in codes]
+        flat = np.ravel_multi_index(codes, shape)
+        chunk = np.bincount(flat, minlength=int(np.prod(shape))).reshape(shape)
+        self.cube += chunk
+        for key, marginal in self._marginals.items():
+            marginal += chunk.sum(axis=self._dropped_axes(key))
+
+    def _dropped_axes(self, key):
+        return tuple(i for i in range(self.cube.ndim) if i not in key)
+
+    @property
+    def total(self):
+        """Number of counted rows."""
+        return int(self.cube.sum())
+
+    def marginal(self, columns):
+        """
+        Counts of the combinations of `columns`, summed over the other axes.
+
+        The result is cached, so repeated breakdowns over the same columns
+        cost a single reduction of the cube.
+
+        Args:
+            columns ([list]): Subset of the cube columns, in the order wanted
+                for the axes of the result.
+
+        Returns:
+            [np.ndarray]: Array with one axis per column of `columns`.
+        """
+        columns = list(columns)
+        axes = [self._axis[col] for col in columns]
+        key = tuple(sorted(axes))
+        if key not in self._marginals:
+            self._marginals[key] = self.cube.sum(axis=self._dropped_axes(key))
+        return self._marginals[key].transpose([key.index(i) for i in axes])
+
+    def count(self, conditions=None, **kwargs):
+        """
+        Number of rows matching every `column == value` condition.
+
+        Conditions can be given as a dict (any column name) or as keyword
+        arguments. Values never seen in the data count as 0.
+        """
+        conditions = dict(conditions or {}, **kwargs)
+        if not conditions:
+            return self.total
+        columns = list(conditions)
+        try:
+            index = tuple(self._position[col][conditions[col]] for col in columns)
+        except KeyError:
+            for col in columns:
+                if col not in self._axis:
+                    raise KeyError("'{}' is not a column of the cube".format(col))
+            return 0
+        return int(self.marginal(columns)[index])
+
+    def rate(self, event, given=None):
+        """
+        Proportion of the rows matching `given` that also match `event`.
+
+        Args:
+            event ([dict]): Conditions of the event, e.g. {'admitted': True}.
+            given ([dict], optional): Conditions defining the group. The
+                whole data when None.
+
+        Returns:
+            [float]: The rate, or nan when no row matches `given`.
+        """
+        given = dict(given or {})
+        for col, value in event.items():
+            if col in given and given[col] != value:
+                return 0.0 if self.count(given) else np.nan
+        denominator = self.count(given)
+        if denominator == 0:
+            return np.nan
+        return self.count({**given, **event}) / denominator
+
+    def table(self, columns):
+        """Counts of `columns` as a pandas Series with a (Multi)Index."""
+        columns = list(columns)
+        index = pd.MultiIndex.from_product([self.levels[col] for col in columns],
+                                           names=columns)
+        if len(columns) == 1:
+            index = index.get_level_values(0)
+        return pd.Series(self.marginal(columns).ravel(), index=index)
+
+    def rates(self, event, by):
+        """
+        Rate of `event` inside every group of the columns `by`.
+
+        Args:
+            event ([dict]): Conditions of the event, e.g. {'admitted': True}.
+                Its columns must not be part of `by`.
+            by ([list]): Columns defining the groups.
+
+        Returns:
+            [pd.Series]: One rate per combination of `by` (nan for empty groups).
+        """
+        by = list(by)
+        event_columns = list(event)
+        if set(by) & set(event_columns):
+            raise ValueError("'event' and 'by' must use different columns")
+        joint = self.marginal(by + event_columns)
+        index = (slice(None),) * len(by)
+        try:
+            index += tuple(self._position[col][event[col]] for col in event_columns)
+            numerator = joint[index]
+        except KeyError:
+            numerator = np.zeros(joint.shape[:len(by)])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            values = numerator / self.marginal(by)
+        result = self.table(by).astype(float)
+        result[:] = values.ravel()
+        return result
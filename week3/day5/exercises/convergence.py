@@ -0,0 +1,68 @@
+"""
+Law of large numbers with early stopping.
+
+'6.Law of Large Numbers.ipynb' looks at np.random.choice(pop_data, n).mean()
+for a few fixed n. estimate_mean keeps drawing in batches, tracks the running
+mean and variance and stops as soon as the confidence interval of the mean is
+as narrow as requested:
+
+    result = estimate_mean(lambda n, rng: rng.choice(pop_data, n),
+                           half_width=1, rng=42)
+    result["mean"], result["n"], result["trace"]
+"""
+from statistics import NormalDist
+
+import numpy as np
+
+from montecarlo import MeanVar
+
+
+def estimate_mean(draw, half_width=None, rtol=None, level=0.95, batch_size=10000,
+                  min_draws=1000, max_draws=10**9, rng=None):
+    """
+    Estimate the mean of the values returned by `draw` until the half-width
+    of its confidence interval reaches the target.
+
+    Args:
+        draw ([callable]): draw(n, rng) returns n random values, like the
+            simulations of montecarlo.run_simulation.
+        half_width ([float], optional): Absolute target for the half-width.
+        rtol ([float], optional): Target relative to the absolute value of the
+            running mean. At least one of `half_width` and `rtol` is required;
+            with both, the first one reached stops the run.
+        level ([float]): Confidence level of the interval.
+        batch_size ([int]): Values drawn between two checks.
+        min_draws ([int]): Values drawn before the first check, so that the
+            variance estimate is not based on a handful of values.
+        max_draws ([int]): Budget. The run stops here even if not converged.
+        rng ([int or np.random.Generator], optional): Seed or generator.
+
+    Returns:
+        [dict]: 'mean', 'half_width', 'n', 'converged' and 'trace', a dict of
+            arrays with the 'n', 'mean' and 'half_width' after every batch.
+    """
+    if half_width is None and rtol is None:
+        raise ValueError("Either 'half_width' or 'rtol' is required")
+    if not isinstance(rng, np.random.Generator):
+        rng = np.random.default_rng(rng)
+    z = NormalDist().inv_cdf(0.5 + level / 2)
+
+    stats = MeanVar()
+    trace = {"n": [], "mean": [], "half_width": []}
+    converged = False
+    while stats.count < max_draws:
+        n = min(batch_size, max_draws - stats.count)
+        stats = stats.merge(MeanVar.from_values(draw(n, rng)))
+        current = z * stats.std_error
+        trace["n"].append(stats.count)
+        trace["mean"].append(stats.mean)
+        trace["half_width"].append(current)
+        if stats.count >= min_draws and (
+                (half_width is not None and current <= half_width)
+                or (rtol is not None and current <= rtol * abs(stats.mean))):
+            converged = True
+            break
+
+    return {"mean": stats.mean, "half_width": z * stats.std_error, "n": stats.count,
+            "converged": converged,
+            "trace": {key: np.array(values) for key, values in trace.items()}}
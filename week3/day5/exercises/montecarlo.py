@@ -0,0 +1,124 @@
+"""
+Parallel Monte Carlo runner with reproducible random streams.
+
+The simulation notebooks of week3/day5 call np.random.seed(42) and run every
+draw on one core. Here the draws are split in shards of a fixed size, every
+shard gets its own generator spawned from one np.random.SeedSequence and the
+shards run in a process pool:
+
+    def population_mean(n, rng):
+        return MeanVar.from_values(rng.gamma(1, 100, n))
+
+    run_simulation(population_mean, 10**9, seed=42, n_workers=64)
+
+The shards and their seeds only depend on `seed` and `shard_size`, and the
+partial results are merged in shard order, so the output is bit-identical for
+any number of workers.
+"""
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+class MeanVar:
+    """
+    Mergeable count, mean and M2 (sum of squared deviations from the mean).
+
+    Two accumulators built from different draws merge into the accumulator of
+    all the draws (pairwise form of Welford's update).
+    """
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    @classmethod
+    def from_values(cls, values):
+        values = np.asarray(values, dtype=float)
+        if values.size == 0:
+            return cls()
+        mean = values.mean()
+        return cls(values.size, mean, float(((values - mean)**2).sum()))
+
+    def merge(self, other):
+        count = self.count + other.count
+        if count == 0:
+            return MeanVar()
+        delta = other.mean - self.mean
+        mean = self.mean + delta * other.count / count
+        m2 = self.m2 + other.m2 + delta**2 * self.count * other.count / count
+        return MeanVar(count, mean, m2)
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else float("nan")
+
+    @property
+    def std_error(self):
+        return math.sqrt(self.variance / self.count) if self.count > 1 else float("nan")
+
+    def __repr__(self):
+        return "MeanVar(count={}, mean={}, variance={})".format(self.count, self.mean,
+                                                                self.variance)
+
+
+def merge_results(a, b):
+    """
+    Merge two partial results: accumulators with a `merge` method, dicts
+    (merged key by key) or anything supporting `+` (counts, arrays...).
+    """
+    if hasattr(a, "merge"):
+        return a.merge(b)
+    if isinstance(a, dict):
+        return {key: merge_results(a[key], b[key]) if key in a and key in b
+                else a.get(key, b.get(key)) for key in {**a, **b}}
+    return a + b
+
+
+def shard_sizes(n_draws, shard_size):
+    """Sizes of the shards covering `n_draws` draws."""
+    n_shards = max(1, math.ceil(n_draws / shard_size))
+    return [min(shard_size, n_draws - i * shard_size) for i in range(n_shards)]
+
+
+def _run_shard(task):
+    simulation, n, seed_sequence = task
+    return simulation(n, np.random.default_rng(seed_sequence))
+
+
+def run_simulation(simulation, n_draws, seed=None, n_workers=None, shard_size=10**7):
+    """
+    Run `simulation` over `n_draws` draws split across a process pool.
+
+    Args:
+        simulation ([callable]): Picklable function simulation(n, rng) that
+            makes `n` draws with the np.random.Generator `rng` and returns a
+            mergeable result (see merge_results). functools.partial can fix
+            any other argument.
+        n_draws ([int]): Total number of draws.
+        seed ([int], optional): Root seed of the np.random.SeedSequence.
+        n_workers ([int], optional): Number of processes. 1 runs the shards
+            in the current process; None uses every core.
+        shard_size ([int]): Draws per shard. Changing it changes the streams,
+            and therefore the result.
+
+    Returns:
+        The merge of the results of all the shards, in shard order.
+    """
+    sizes = shard_sizes(n_draws, shard_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(simulation, n, s) for n, s in zip(sizes, seeds)]
+    if n_workers == 1 or len(tasks) == 1:
+        return _reduce(map(_run_shard, tasks))
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        return _reduce(pool.map(_run_shard, tasks))
+
+
+def _reduce(results):
+    results = iter(results)
+    total = next(results)
+    for result in results:
+        total = merge_results(total, result)
+    return total
@@ -0,0 +1,145 @@
+"""
+Exact and approximate factorials.
+
+'factorial.ipynb' writes the factorial with a for loop (printing every partial
+product), a while loop and a recursion that hits the recursion limit near
+n=1000. This module has:
+
+- factorial(n): exact n!, for any n (10**6! included).
+- FACTORIAL_TABLE: memoized exact n! for small n.
+- log_factorial(n): log(n!) for arrays of n.
+- log_binomial / binomial_log_likelihood: binomial coefficients and
+  log-likelihoods over arrays.
+- factorial_mod / binomial_mod: n! mod m and C(n, k) mod p for combinatorics.
+"""
+import math
+from itertools import accumulate
+
+import numpy as np
+
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+
+# 170! is the largest factorial that fits in a float
+SMALL_N = 171
+FACTORIAL_TABLE = [1] + list(accumulate(range(1, SMALL_N), lambda a, b: a * b))
+_LOG_FACTORIAL_TABLE = np.array([math.lgamma(n + 1) for n in range(SMALL_N)])
+
+
+def _check_n(n):
+    if not isinstance(n, (int, np.integer)) or n < 0:
+        raise ValueError("n must be a non-negative integer")
+    return int(n)
+
+
+def _as_counts(n):
+    """`n` as an int64 array, or ValueError if it has negative or non-whole values."""
+    n = np.asarray(n)
+    if n.dtype.kind == "f":
+        with np.errstate(invalid="ignore"):
+            if not np.all(np.isfinite(n) & (n == np.floor(n))):
+                raise ValueError("n must hold whole numbers")
+        n = n.astype(np.int64)
+    elif n.dtype.kind not in "iub":
+        raise ValueError("n must be an integer or an array of integers")
+    if np.any(n < 0):
+        raise ValueError("n must be non-negative")
+    return n
+
+
+def factorial(n):
+    """
+    Exact n!.
+
+    Small n come from FACTORIAL_TABLE. Larger n use gmpy2 when it is
+    installed and math.factorial otherwise, which already multiplies the odd
+    parts of n! by binary splitting in C. Neither recurses in Python, so
+    there is no recursion limit and no partial product is printed.
+    """
+    n = _check_n(n)
+    if n < SMALL_N:
+        return FACTORIAL_TABLE[n]
+    if gmpy2 is not None:
+        return int(gmpy2.fac(n))
+    return math.factorial(n)
+
+
+def log_factorial(n):
+    """
+    log(n!) for a non-negative integer or an array of them. Floats holding
+    whole numbers (counts read with pandas, for instance) are accepted.
+
+    n < 171 is looked up in a table; larger n use Stirling's series, whose
+    error there is below the float precision. Everything is vectorized, so
+    arrays of millions of values take a few milliseconds.
+    """
+    n = _as_counts(n)
+    small = n < SMALL_N
+    x = np.where(small, SMALL_N, n).astype(float)
+    stirling = (x * np.log(x) - x + 0.5 * np.log(2 * np.pi * x)
+                + 1 / (12 * x) - 1 / (360 * x**3) + 1 / (1260 * x**5))
+    result = np.where(small, _LOG_FACTORIAL_TABLE[np.where(small, n, 0)], stirling)
+    return result if result.ndim else float(result)
+
+
+def log_binomial(n, k):
+    """log C(n, k), vectorized over n and k (0 <= k <= n)."""
+    n, k = _as_counts(n), _as_counts(k)
+    return log_factorial(n) - log_factorial(k) - log_factorial(n - k)
+
+
+def binomial_log_likelihood(k, n, p):
+    """
+    Log-likelihood of k successes in n trials with success probability p,
+    vectorized over k, n and p. p = 0 and p = 1 give 0 or -inf, not nan.
+    """
+    k, n, p = _as_counts(k), _as_counts(n), np.asarray(p, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        successes = np.where(k == 0, 0.0, k * np.log(p))
+        failures = np.where(n - k == 0, 0.0, (n - k) * np.log1p(-p))
+    return log_binomial(n, k) + successes + failures
+
+
+def factorial_mod(n, m):
+    """
+    n! mod m.
+
+    n! is a multiple of m when n >= m, so only n < m needs any work. With
+    m < 2**31 the products of two residues fit in int64 and the n factors are
+    multiplied as a vectorized product tree.
+    """
+    n, m = _check_n(n), _check_n(m)
+    if m == 1 or n >= m:
+        return 0
+    if n < SMALL_N:
+        return FACTORIAL_TABLE[n] % m
+    if m >= 2**31:
+        result = 1
+        for i in range(2, n + 1):
+            result = result * i % m
+        return result
+    factors = np.arange(1, n + 1, dtype=np.int64)
+    while len(factors) > 1:
+        if len(factors) % 2:
+            factors = np.append(factors, 1)
+        factors = factors[0::2] * factors[1::2] % m
+    return int(factors[0])
+
+
+def binomial_mod(n, k, p):
+    """
+    C(n, k) mod p for a prime p, with Lucas' theorem for n >= p.
+    """
+    n, k, p = _check_n(n), _check_n(k), _check_n(p)
+    result = 1
+    while n or k:
+        n_digit, k_digit = n % p, k % p
+        if k_digit > n_digit:
+            return 0
+        numerator = factorial_mod(n_digit, p)
+        denominator = factorial_mod(k_digit, p) * factorial_mod(n_digit - k_digit, p) % p
+        result = result * numerator * pow(denominator, p - 2, p) % p
+        n, k = n // p, k // p
+    return result
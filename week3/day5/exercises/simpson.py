@@ -0,0 +1,109 @@
+"""
+Automatic Simpson's paradox screening.
+
+'2.Simpsons_paradox.ipynb' shows by hand that the admission rate of the
+female students is lower overall but higher inside every major. This module
+looks for that kind of reversal in every (outcome, treatment, confounder)
+combination of the categorical columns of a dataset:
+
+    reversals = simpson_reversals(df)
+"""
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from contingency import encode_columns
+
+RESULT_COLUMNS = ["outcome", "outcome_level", "treatment", "level_a", "level_b",
+                  "confounder", "aggregate_diff", "n_strata",
+                  "min_stratum_diff", "max_stratum_diff"]
+
+
+def categorical_columns(df, max_levels=20):
+    """Columns of `df` with between 2 and `max_levels` distinct values."""
+    nunique = df.nunique()
+    return [col for col in df.columns if 2 <= nunique[col] <= max_levels]
+
+
+def _reversals(table, min_count):
+    """
+    Reversals of a single (outcome, treatment, confounder) count table.
+
+    Yields (outcome_level, i, j, aggregate_diff, n_strata, min_diff, max_diff)
+    for every outcome level and pair of treatment levels i < j whose
+    aggregate rate difference changes sign in every usable stratum.
+    """
+    n_outcome, n_treatment, _ = table.shape
+    totals = table.sum(axis=0)
+    usable = totals >= min_count
+    pair_a, pair_b = np.triu_indices(n_treatment, 1)
+    both = usable[pair_a] & usable[pair_b]
+    n_strata = both.sum(axis=1)
+    # With a binary outcome the second level carries all the information
+    outcome_levels = [1] if n_outcome == 2 else range(n_outcome)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for level in outcome_levels:
+            events = table[level]
+            aggregate = events.sum(axis=1) / totals.sum(axis=1)
+            strata = events / totals
+            aggregate_diff = aggregate[pair_a] - aggregate[pair_b]
+            stratum_diff = np.where(both, strata[pair_a] - strata[pair_b], np.nan)
+            same_side = np.where(both, stratum_diff * aggregate_diff[:, None] >= 0, False)
+            reversed_ = ((aggregate_diff != 0) & (n_strata > 0)
+                         & ~same_side.any(axis=1))
+            for k in np.flatnonzero(reversed_):
+                yield (level, pair_a[k], pair_b[k], aggregate_diff[k], n_strata[k],
+                       np.nanmin(stratum_diff[k]), np.nanmax(stratum_diff[k]))
+
+
+def simpson_reversals(df, columns=None, max_levels=20, min_count=1):
+    """
+    Find every Simpson's paradox between the categorical columns of `df`.
+
+    Each column is dictionary-encoded once. Every unordered triple of columns
+    is counted with a single bincount, reusing the combined codes of its first
+    pair, and that 3-way table is shared by the 6 ways of assigning the
+    outcome, treatment and confounder roles.
+
+    Args:
+        df ([pd.DataFrame]): Data to screen.
+        columns ([list], optional): Columns to combine. By default the output
+            of `categorical_columns(df, max_levels)`.
+        max_levels ([int]): Maximum number of distinct values of a column.
+        min_count ([int]): Minimum number of rows of a (treatment, stratum)
+            cell for the stratum to be compared.
+
+    Returns:
+        [pd.DataFrame]: One row per reversal, sorted by the absolute
+            aggregate rate difference. `aggregate_diff` is the rate of
+            `level_a` minus the rate of `level_b` over all the data and the
+            stratum differences have the opposite sign in every stratum.
+    """
+    if columns is None:
+        columns = categorical_columns(df, max_levels)
+    codes, levels = encode_columns(df, columns)
+    # Shift the codes so that missing values (-1) get their own slot 0
+    codes = [col_codes.astype(np.int64) + 1 for col_codes in codes]
+    sizes = [len(levels[col]) + 1 for col in columns]
+
+    rows = []
+    for a, b in itertools.combinations(range(len(columns)), 2):
+        pair_codes = codes[a] * sizes[b] + codes[b]
+        for c in range(b + 1, len(columns)):
+            shape = (sizes[a], sizes[b], sizes[c])
+            flat = pair_codes * sizes[c] + codes[c]
+            table = np.bincount(flat, minlength=int(np.prod(shape))).reshape(shape)
+            table = table[1:, 1:, 1:]
+            triple = (a, b, c)
+            for roles in itertools.permutations(range(3)):
+                outcome, treatment, confounder = (columns[triple[r]] for r in roles)
+                for level, i, j, diff, n_strata, low, high in _reversals(
+                        table.transpose(roles), min_count):
+                    rows.append((outcome, levels[outcome][level], treatment,
+                                 levels[treatment][i], levels[treatment][j],
+                                 confounder, diff, n_strata, low, high))
+
+    result = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+    order = result["aggregate_diff"].abs().sort_values(ascending=False).index
+    return result.loc[order].reset_index(drop=True)
@@ -0,0 +1,45 @@
+import numpy as np
+
+from bayes_classifier import GaussianNaiveBayes
+
+
+def _two_classes_and_a_rare_one():
+    rng = np.random.default_rng(0)
+    X = np.vstack([rng.normal(0, 1, (500, 2)), rng.normal(5, 1, (500, 2)), [[20, 20]]])
+    y = np.array(["a"] * 500 + ["b"] * 500 + ["rare"])
+    return X, y
+
+
+def test_class_with_a_single_row():
+    X, y = _two_classes_and_a_rare_one()
+    model = GaussianNaiveBayes().fit(X, y)
+    assert np.isfinite(model.variances_).all()
+    log_proba = model.predict_log_proba(X[:1000])
+    assert not np.isnan(log_proba).any()
+    assert (model.predict(X[:1000]) == y[:1000]).mean() > 0.95
+    assert model.predict(X[-1:])[0] == "rare"
+
+
+def test_class_with_a_single_row_in_partial_fit():
+    X, y = _two_classes_and_a_rare_one()
+    model = GaussianNaiveBayes()
+    for chunk in np.array_split(np.arange(len(X)), 7):
+        model.partial_fit(X[chunk], y[chunk])
+    full = GaussianNaiveBayes().fit(X, y)
+    np.testing.assert_allclose(model.variances_, full.variances_)
+    np.testing.assert_array_equal(model.predict(X), full.predict(X))
+
+
+def test_predict_accepts_rows_lists_and_iterators():
+    import pandas as pd
+
+    X, y = _two_classes_and_a_rare_one()
+    df = pd.DataFrame(X, columns=["height", "weight"])
+    model = GaussianNaiveBayes().fit(df, y)
+    expected = model.predict(X[:3])
+    assert list(model.predict(X[:3].tolist())) == list(expected)
+    assert model.predict(X[0].tolist())[0] == expected[0]
+    assert model.predict(tuple(X[0]))[0] == expected[0]
+    assert model.predict(df.iloc[0])[0] == expected[0]
+    batches = (df.iloc[i:i + 2] for i in range(0, 4, 2))
+    assert list(model.predict(batches)) == list(model.predict(X[:4]))
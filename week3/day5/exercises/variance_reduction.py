@@ -0,0 +1,71 @@
+"""
+Variance reduction for the week3/day5 simulations.
+
+All the simulation engines turn uniform numbers into draws. Instead of plain
+pseudo-random uniforms they can take any function uniforms(n, d, rng) that
+returns an (n x d) array in [0, 1), and this module provides three of them:
+
+- antithetic: the second half of the rows is 1 - u of the first half.
+- stratified: Latin hypercube, every column has exactly one value in each
+  of the n strata [i/n, (i+1)/n).
+- sobol: scrambled Sobol low-discrepancy points (needs scipy >= 1.7).
+
+    from variance_reduction import make_uniforms
+    bootstrap(students, 20, 2**16, uniforms=make_uniforms("sobol"))
+    simulate_flips(10**6, uniforms=make_uniforms("stratified"))
+    simular(10**6, uniformes=make_uniforms("antithetic"))  # Monty Hall
+"""
+import numpy as np
+
+
+def random_uniforms(n, d, rng):
+    """Plain pseudo-random uniforms."""
+    return rng.random((n, d))
+
+
+def antithetic_uniforms(n, d, rng):
+    """Pairs (u, 1 - u). With an odd n the last row is a plain uniform."""
+    half = rng.random((n // 2, d))
+    rows = [half, 1 - half]
+    if n % 2:
+        rows.append(rng.random((1, d)))
+    return np.concatenate(rows)
+
+
+def stratified_uniforms(n, d, rng):
+    """
+    Latin hypercube sample: one uniform inside every stratum of every column,
+    with the strata of every column shuffled independently.
+    """
+    strata = rng.permuted(np.tile(np.arange(n), (d, 1)), axis=1).T
+    return (strata + rng.random((n, d))) / n
+
+
+def sobol_uniforms(n, d, rng):
+    """
+    Scrambled Sobol points. Every call uses a new scrambling, so repeated
+    calls are independent randomized quasi-Monte Carlo replicates.
+
+    The balance properties only hold when n is a power of 2. Other n draw the
+    next power of 2 and keep the first n points; the simulation engines
+    avoid that by splitting their work in blocks of 2**m draws when the
+    uniforms function has power_of_two = True.
+    """
+    from scipy.stats import qmc
+    m = max(int(n - 1).bit_length(), 0)
+    return qmc.Sobol(d, scramble=True, seed=rng).random_base2(m)[:n]
+
+
+sobol_uniforms.power_of_two = True
+
+
+METHODS = {"random": random_uniforms, "antithetic": antithetic_uniforms,
+           "stratified": stratified_uniforms, "sobol": sobol_uniforms}
+
+
+def make_uniforms(method="random"):
+    """Function uniforms(n, d, rng) of the variance reduction `method`."""
+    try:
+        return METHODS[method]
+    except KeyError:
+        raise ValueError("Unknown method '{}', use one of {}".format(method, list(METHODS)))
@@ -0,0 +1,255 @@
+"""
+Simulación vectorizada del problema de Monty Hall.
+
+'Montyhall_noclasses.ipynb' juega un concurso en cada llamada a jugar() y el
+presentador elige su puerta repitiendo el sorteo hasta acertar. Aquí se juegan
+millones de concursos a la vez con arrays de NumPy:
+
+    resultado = simular(10**9, rng=42)
+    resultado["gana_cambiando"] / resultado["juegos"]
+
+También se generaliza a n puertas con k puertas abiertas por el presentador,
+comparando la simulación con la probabilidad exacta:
+
+    simular_n(10**7, n_puertas=100, k_reveladas=98, rng=42)
+"""
+from statistics import NormalDist
+
+import numpy as np
+
+
+def _generador(rng):
+    """Devuelve un np.random.Generator a partir de una semilla o de otro Generator."""
+    if isinstance(rng, np.random.Generator):
+        return rng
+    return np.random.default_rng(rng)
+
+
+def jugar_lote(n_juegos, rng=None, uniformes=None):
+    """
+    Juega `n_juegos` concursos a la vez. Las puertas son 1, 2 y 3.
+
+    La puerta del presentador se calcula sin repetir sorteos: si el
+    concursante no ha elegido la ganadora solo queda una puerta posible
+    (6 - ganadora - elegida); si la ha elegido, el presentador abre una de
+    las otras dos al azar.
+
+    Las dos estrategias salen de los mismos sorteos: quedarse gana cuando la
+    puerta elegida es la ganadora y cambiar gana en el resto de casos.
+
+    `uniformes` es una función opcional uniformes(n, d, rng) que devuelve
+    números en [0, 1), por ejemplo variance_reduction.make_uniforms("sobol"),
+    para sortear las puertas con técnicas de reducción de varianza.
+
+    Returns:
+        [dict]: Arrays con las puertas 'ganadora', 'elegida', 'descartada' y
+            'cambiada', y los booleanos 'gana_sin_cambiar' y 'gana_cambiando'.
+    """
+    rng = _generador(rng)
+    if uniformes is None:
+        ganadora = rng.integers(1, 4, size=n_juegos, dtype=np.int8)
+        elegida = rng.integers(1, 4, size=n_juegos, dtype=np.int8)
+        # Desplazamiento de 1 o 2 puertas desde la elegida, para cuando acierta
+        salto = rng.integers(1, 3, size=n_juegos, dtype=np.int8)
+    else:
+        u = uniformes(n_juegos, 3, rng)
+        ganadora, elegida, salto = (
+            np.minimum(u[:, i] * n, n - 1).astype(np.int8) + 1
+            for i, n in enumerate((3, 3, 2)))
+
+    acierta = ganadora == elegida
+    descartada = np.where(acierta, (elegida - 1 + salto) % 3 + 1,
+                          6 - ganadora - elegida).astype(np.int8)
+    # 1+2+3=6. Solo existe una puerta para cambiar.
+    cambiada = 6 - elegida - descartada
+    return {"ganadora": ganadora, "elegida": elegida, "descartada": descartada,
+            "cambiada": cambiada, "gana_sin_cambiar": acierta,
+            "gana_cambiando": ~acierta}
+
+
+def simular(n_juegos, rng=None, tamano_bloque=10**7, uniformes=None):
+    """
+    Juega `n_juegos` concursos en bloques de `tamano_bloque` juegos, para que
+    la memoria no dependa del número total de juegos. `uniformes` se pasa a
+    jugar_lote.
+
+    Returns:
+        [dict]: Número de 'juegos' y de victorias 'gana_sin_cambiar' y
+            'gana_cambiando'.
+    """
+    rng = _generador(rng)
+    if getattr(uniformes, "power_of_two", False):
+        # Los puntos de Sobol solo están equilibrados en bloques de 2**m juegos
+        tamano_bloque = 1 << (tamano_bloque.bit_length() - 1)
+    resultado = {"juegos": 0, "gana_sin_cambiar": 0, "gana_cambiando": 0}
+    while resultado["juegos"] < n_juegos:
+        n = min(tamano_bloque, n_juegos - resultado["juegos"])
+        gana_sin_cambiar = int(np.count_nonzero(jugar_lote(n, rng, uniformes)["gana_sin_cambiar"]))
+        resultado["juegos"] += n
+        resultado["gana_sin_cambiar"] += gana_sin_cambiar
+        resultado["gana_cambiando"] += n - gana_sin_cambiar
+    return resultado
+
+
+def probabilidad_teorica(n_puertas=3, k_reveladas=1):
+    """
+    Probabilidad exacta de ganar con cada estrategia con `n_puertas` puertas
+    y `k_reveladas` puertas abiertas por el presentador.
+
+    Returns:
+        [tuple]: (sin cambiar, cambiando). Cambiando se elige al azar una de
+            las n - 1 - k puertas que siguen cerradas.
+    """
+    n_puertas = np.asarray(n_puertas, dtype=float)
+    sin_cambiar = 1 / n_puertas
+    cambiando = (n_puertas - 1) / n_puertas / (n_puertas - 1 - k_reveladas)
+    return sin_cambiar, cambiando
+
+
+def _saltar(r, a, b):
+    """
+    Convierte r en [0, n - 2) en una puerta de [0, n) distinta de a y de b
+    (con a != b), sin construir la lista de puertas.
+    """
+    menor, mayor = np.minimum(a, b), np.maximum(a, b)
+    puerta = r + (r >= menor)
+    return puerta + (puerta >= mayor)
+
+
+def jugar_lote_n(n_juegos, n_puertas=3, k_reveladas=1, rng=None):
+    """
+    Juega `n_juegos` concursos con `n_puertas` puertas (numeradas desde 1) en
+    los que el presentador abre `k_reveladas` puertas sin premio y el
+    concursante que cambia elige al azar entre las que siguen cerradas.
+
+    `n_puertas` y `k_reveladas` pueden ser arrays de longitud `n_juegos`, un
+    valor por concurso, para barrer parámetros en una sola llamada. Las
+    puertas se calculan con aritmética de índices, así que el coste no
+    depende del número de puertas.
+
+    Las puertas candidatas (las distintas de la elegida que el presentador
+    puede abrir, más la ganadora si no es la elegida) se recorren en orden
+    circular desde la posición 'inicio': las primeras quedan cerradas y las
+    k siguientes sin premio son las que abre el presentador. Como 'inicio' es
+    aleatorio, cada candidata tiene la misma probabilidad de quedar abierta.
+    puertas_abiertas(lote, i) devuelve las puertas abiertas del concurso i.
+
+    Returns:
+        [dict]: Arrays con las puertas 'ganadora', 'elegida' y 'cambiada', los
+            booleanos 'gana_sin_cambiar' y 'gana_cambiando', y 'n_puertas',
+            'k_reveladas' e 'inicio' para reconstruir las puertas abiertas.
+    """
+    rng = _generador(rng)
+    n_puertas = np.broadcast_to(np.asarray(n_puertas, dtype=np.int64), (n_juegos,))
+    k_reveladas = np.broadcast_to(np.asarray(k_reveladas, dtype=np.int64), (n_juegos,))
+    if np.any(k_reveladas < 0) or np.any(k_reveladas > n_puertas - 2):
+        raise ValueError("El presentador solo puede abrir entre 0 y n_puertas - 2 puertas")
+
+    ganadora = rng.integers(0, n_puertas)
+    elegida = rng.integers(0, n_puertas)
+    acierta = ganadora == elegida
+    # Puertas sin premio, distintas de la elegida, entre las que abre el
+    # presentador: n - 1 si el concursante acierta y n - 2 si no
+    cabras = np.where(acierta, n_puertas - 1, np.maximum(n_puertas - 2, 1))
+    inicio = rng.integers(0, cabras)
+    # Posición de la puerta cambiada entre las n - 1 - k que siguen cerradas
+    # (0 es la ganadora cuando el concursante no la ha elegido)
+    posicion = rng.integers(0, n_puertas - 1 - k_reveladas)
+
+    # Si acierta, las cerradas son las cabras inicio, inicio + 1, ...
+    otra = (inicio + posicion) % cabras
+    cambiada_acierta = otra + (otra >= elegida)
+    # Si no acierta, la ganadora y las cabras inicio, inicio + 1, ...
+    cabra = (inicio + posicion - 1) % cabras
+    cambiada_falla = np.where(posicion == 0, ganadora, _saltar(cabra, elegida, ganadora))
+    cambiada = np.where(acierta, cambiada_acierta, cambiada_falla)
+
+    return {"ganadora": ganadora + 1, "elegida": elegida + 1, "cambiada": cambiada + 1,
+            "gana_sin_cambiar": acierta, "gana_cambiando": cambiada == ganadora,
+            "n_puertas": n_puertas, "k_reveladas": k_reveladas, "inicio": inicio}
+
+
+def puertas_abiertas(lote, i):
+    """Lista de las puertas que abrió el presentador en el concurso `i` de un lote."""
+    n, k = int(lote["n_puertas"][i]), int(lote["k_reveladas"][i])
+    ganadora, elegida = int(lote["ganadora"][i]) - 1, int(lote["elegida"][i]) - 1
+    acierta = ganadora == elegida
+    cabras = n - 1 if acierta else n - 2
+    # Las cabras que siguen cerradas van detrás de 'inicio'; después, las abiertas
+    cerradas = n - 1 - k if acierta else n - 2 - k
+    indices = (int(lote["inicio"][i]) + cerradas + np.arange(k)) % max(cabras, 1)
+    if acierta:
+        puertas = indices + (indices >= elegida)
+    else:
+        puertas = _saltar(indices, elegida, ganadora)
+    return sorted(int(puerta) + 1 for puerta in puertas)
+
+
+def _intervalo(victorias, juegos, nivel):
+    """Intervalo de confianza de Wilson para una proporción."""
+    z = NormalDist().inv_cdf(0.5 + nivel / 2)
+    p = victorias / juegos
+    centro = (p + z**2 / (2 * juegos)) / (1 + z**2 / juegos)
+    margen = z / (1 + z**2 / juegos) * np.sqrt(p * (1 - p) / juegos
+                                              + z**2 / (4 * juegos**2))
+    # El redondeo puede dejar los extremos un poco fuera de [0, 1]
+    return float(np.clip(centro - margen, 0, 1)), float(np.clip(centro + margen, 0, 1))
+
+
+def simular_n(n_juegos, n_puertas=3, k_reveladas=1, rng=None, tamano_bloque=10**7,
+              nivel=0.95):
+    """
+    Juega `n_juegos` concursos de `n_puertas` puertas y `k_reveladas` puertas
+    abiertas en bloques de `tamano_bloque` juegos. `n_puertas` y `k_reveladas`
+    son números: cada llamada simula una sola configuración.
+
+    Returns:
+        [dict]: Para cada estrategia ('sin_cambiar' y 'cambiando'), las
+            victorias, la probabilidad simulada, la teórica y el intervalo de
+            confianza de Wilson con el `nivel` pedido.
+    """
+    if np.ndim(n_puertas) or np.ndim(k_reveladas):
+        raise ValueError("simular_n usa un solo valor de n_puertas y k_reveladas; "
+                         "para varios, jugar_lote_n acepta arrays o usa barrido")
+    rng = _generador(rng)
+    victorias = {"sin_cambiar": 0, "cambiando": 0}
+    jugados = 0
+    while jugados < n_juegos:
+        n = min(tamano_bloque, n_juegos - jugados)
+        lote = jugar_lote_n(n, n_puertas, k_reveladas, rng)
+        victorias["sin_cambiar"] += int(np.count_nonzero(lote["gana_sin_cambiar"]))
+        victorias["cambiando"] += int(np.count_nonzero(lote["gana_cambiando"]))
+        jugados += n
+
+    teorica = dict(zip(["sin_cambiar", "cambiando"],
+                       probabilidad_teorica(n_puertas, k_reveladas)))
+    resultado = {"juegos": n_juegos, "n_puertas": n_puertas, "k_reveladas": k_reveladas}
+    for estrategia, ganadas in victorias.items():
+        resultado[estrategia] = {
+            "victorias": ganadas,
+            "simulada": ganadas / n_juegos,
+            "teorica": float(teorica[estrategia]),
+            "intervalo": _intervalo(ganadas, n_juegos, nivel),
+        }
+    return resultado
+
+
+def barrido(n_juegos, parametros, rng=None, nivel=0.95):
+    """
+    Ejecuta simular_n para cada par (n_puertas, k_reveladas) de `parametros`
+    con el mismo generador. Cada par se simula vectorizado sobre sus
+    `n_juegos` juegos; el bucle es solo sobre los pares.
+
+    Returns:
+        [list]: Un diccionario por par, listo para pd.DataFrame.
+    """
+    rng = _generador(rng)
+    filas = []
+    for n_puertas, k_reveladas in parametros:
+        resultado = simular_n(n_juegos, n_puertas, k_reveladas, rng, nivel=nivel)
+        fila = {"n_puertas": n_puertas, "k_reveladas": k_reveladas}
+        for estrategia in ("sin_cambiar", "cambiando"):
+            for clave, valor in resultado[estrategia].items():
+                fila[estrategia + "_" + clave] = valor
+        filas.append(fila)
+    return filas
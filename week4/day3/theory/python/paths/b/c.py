@@ -1,4 +1,15 @@
-import s.j as j
+import os
+import sys
+
+# lazy_import.py está en others/resources/python/utils, junto a la raíz del repositorio
+path_utils = os.path.abspath(os.path.join(os.path.dirname(__file__), *[".."] * 6,
+                                          "others", "resources", "python", "utils"))
+if path_utils not in sys.path:
+    sys.path.append(path_utils)
+
+from lazy_import import lazy_import
+
+j = lazy_import("s.j")
 
 variable_de_c = 0
 
@@ -6,3 +17,4 @@ def f3(k, l, r):
     print("Esta es la variable de c:", variable_de_c)
     return k + l + r
 
+
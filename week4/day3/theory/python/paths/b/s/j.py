@@ -1,5 +1,16 @@
+import os
 import sys
-import pandas as pd 
+
+# lazy_import.py está en others/resources/python/utils, junto a la raíz del repositorio
+path_utils = os.path.abspath(os.path.join(os.path.dirname(__file__), *[".."] * 7,
+                                          "others", "resources", "python", "utils"))
+if path_utils not in sys.path:
+    sys.path.append(path_utils)
+
+from lazy_import import lazy_import
+
+pd = lazy_import("pandas")
+
 def f_j():
     print("f_j")
     
@@ -0,0 +1,172 @@
+"""
+Render large grids of subplots in parallel.
+
+A figure with hundreds of axes is drawn by one process, panel after panel.
+`render_grid` draws every panel as its own small figure in a pool of worker
+processes (each worker reuses a single Agg figure), and pastes the rasterized
+panels into one image:
+
+    def histogram(ax, data):
+        ax.hist(data, bins=30)
+
+    image = render_grid(samples, histogram, nrows=20, ncols=20,
+                        sharex=True, sharey=True, path="grid.png")
+
+With sharex/sharey the limits are shared like in plt.subplots(sharex=True,
+sharey=True): the workers first report the autoscaled limits of their
+panels, the parent merges them and computes the ticks once, and only the
+left column and bottom row show tick labels.
+
+`draw` must be a module-level function so it can be sent to the workers.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Position of the axes inside each panel, as fractions of the panel, so that
+# all the panels line up when pasted together
+AXES_RECT = (0.2, 0.15, 0.75, 0.75)
+
+_figure = None
+_draw = None
+
+
+def _init_worker(draw, panel_size, dpi):
+    global _figure, _draw
+    # Figure + FigureCanvasAgg do not need pyplot nor a display
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    _figure = Figure(figsize=panel_size, dpi=dpi)
+    FigureCanvasAgg(_figure)
+    _figure.add_axes(AXES_RECT)
+    _draw = draw
+
+
+def _draw_panel(data):
+    ax = _figure.axes[0]
+    ax.clear()
+    _draw(ax, data)
+    return ax
+
+
+def _panel_limits(data):
+    ax = _draw_panel(data)
+    ax.autoscale_view()
+    return ax.get_xlim(), ax.get_ylim()
+
+
+def _render_panel(task):
+    data, title, xlim, ylim, xticks, yticks, x_labels, y_labels = task
+    ax = _draw_panel(data)
+    if xlim is not None:
+        ax.set_xlim(xlim)
+    if ylim is not None:
+        ax.set_ylim(ylim)
+    if xticks is not None:
+        ax.set_xticks(xticks)
+    else:
+        ax.locator_params(axis="x", nbins=4)
+    if yticks is not None:
+        ax.set_yticks(yticks)
+    else:
+        ax.locator_params(axis="y", nbins=4)
+    ax.tick_params(labelbottom=x_labels, labelleft=y_labels, labelsize="small")
+    if title is not None:
+        ax.set_title(title, fontsize="small")
+    _figure.canvas.draw()
+    return np.asarray(_figure.canvas.buffer_rgba()).copy()
+
+
+def _shared_limits(limits):
+    low = min(limit[0] for limit in limits)
+    high = max(limit[1] for limit in limits)
+    return low, high
+
+
+def _shared_ticks(limits, nbins=4):
+    from matplotlib.ticker import MaxNLocator
+
+    ticks = MaxNLocator(nbins=nbins).tick_values(*limits)
+    return ticks[(ticks >= limits[0]) & (ticks <= limits[1])]
+
+
+def render_grid(panels, draw, nrows, ncols, titles=None, sharex=False, sharey=False,
+                xlim=None, ylim=None, panel_size=(2.0, 2.0), dpi=100,
+                n_workers=None, chunksize=8, path=None):
+    """
+    Draw one panel per element of `panels` and paste them in a grid.
+
+    Args:
+        panels (sequence): Data of each panel, row by row. Up to
+            nrows * ncols elements; the remaining cells are left blank.
+        draw (callable): draw(ax, data) draws one panel. Module-level function.
+        nrows, ncols (int): Shape of the grid.
+        titles (sequence, optional): Title of each panel.
+        sharex, sharey (bool): Share the limits and ticks of the x / y axes.
+        xlim, ylim (tuple, optional): Fixed limits for every panel. They
+            skip the pass that computes the shared limits.
+        panel_size (tuple): Size of each panel in inches.
+        dpi (int): Resolution.
+        n_workers (int, optional): Number of processes. Defaults to one per
+            CPU; with 1 everything is drawn in this process.
+        chunksize (int): Panels sent together to each worker.
+        path (str, optional): If given, the image is also saved there (the
+            format is taken from the extension, PNG by default).
+
+    Returns:
+        np.ndarray: RGBA image of shape (nrows * panel height, ncols * panel
+            width, 4), dtype uint8.
+    """
+    panels = list(panels)
+    if len(panels) > nrows * ncols:
+        raise ValueError("{} panels do not fit in a {}x{} grid".format(len(panels), nrows, ncols))
+    titles = [None] * len(panels) if titles is None else list(titles)
+    if len(titles) != len(panels):
+        raise ValueError("{} titles for {} panels".format(len(titles), len(panels)))
+
+    def run(pool):
+        mapper = (lambda func, tasks: map(func, tasks)) if pool is None else \
+            (lambda func, tasks: pool.map(func, tasks, chunksize=chunksize))
+        shared_x, shared_y = xlim, ylim
+        if (sharex and xlim is None) or (sharey and ylim is None):
+            limits = list(mapper(_panel_limits, panels))
+            if sharex and xlim is None:
+                shared_x = _shared_limits([limit[0] for limit in limits])
+            if sharey and ylim is None:
+                shared_y = _shared_limits([limit[1] for limit in limits])
+        xticks = _shared_ticks(shared_x) if sharex else None
+        yticks = _shared_ticks(shared_y) if sharey else None
+
+        tasks = []
+        for i, (data, title) in enumerate(zip(panels, titles)):
+            col = i % ncols
+            # Like plt.subplots(sharex=True): labels only on the outer panels.
+            # The bottom row is the last panel of each column.
+            x_labels = not sharex or i + ncols >= len(panels)
+            y_labels = not sharey or col == 0
+            tasks.append((data, title, shared_x, shared_y, xticks, yticks,
+                          x_labels, y_labels))
+        return list(mapper(_render_panel, tasks))
+
+    if n_workers == 1:
+        _init_worker(draw, panel_size, dpi)
+        images = run(None)
+    else:
+        with ProcessPoolExecutor(n_workers, initializer=_init_worker,
+                                 initargs=(draw, panel_size, dpi)) as pool:
+            images = run(pool)
+
+    height, width = images[0].shape[:2] if images else \
+        (int(round(panel_size[1] * dpi)), int(round(panel_size[0] * dpi)))
+    grid = np.full((nrows * height, ncols * width, 4), 255, dtype=np.uint8)
+    for i, image in enumerate(images):
+        row, col = divmod(i, ncols)
+        grid[row * height:(row + 1) * height, col * width:(col + 1) * width] = image
+
+    if path is not None:
+        import matplotlib.image
+
+        matplotlib.image.imsave(path, grid, format=os.path.splitext(path)[1][1:] or "png")
+    return grid
@@ -1,7 +1,19 @@
 import name_main
+import os
+import sys
 
-print("-----------")
-print("Ejecución de 'a'")
+# module_init.py está en others/resources/python/utils, junto a la raíz del repositorio
+path_utils = os.path.abspath(os.path.join(os.path.dirname(__file__), *[".."] * 5,
+                                          "others", "resources", "python", "utils"))
+if path_utils not in sys.path:
+    sys.path.append(path_utils)
+
+from module_init import init_hook, finish_init
+
+@init_hook
+def inicio():
+    print("-----------")
+    print("Ejecución de 'a'")
 
 def y():
     return 7
@@ -13,8 +25,12 @@ def x():
    
 f = 2
  
-print("Fin de ejecución de 'a'")
-print("-----------")
+@init_hook
+def fin():
+    print("Fin de ejecución de 'a'")
+    print("-----------")
+
+    if __name__ == "__main__":
+        print("__name__ de a cumple condición")
 
-if __name__ == "__main__":
-    print("__name__ de a cumple condición")
\ No newline at end of file
+finish_init(__name__)
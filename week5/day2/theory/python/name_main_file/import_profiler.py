@@ -0,0 +1,163 @@
+"""
+Perfilador de importaciones.
+
+Importa un módulo en un proceso nuevo, como `python -X importtime`, y muestra
+el árbol de módulos importados con su tiempo propio y acumulado. Además marca:
+
+- los módulos que escriben por pantalla al importarse (código a nivel de
+  módulo fuera de `if __name__ == "__main__":`),
+- las importaciones circulares (importar un módulo que aún se está
+  ejecutando, como hacen 'a.py' y 'name_main.py'),
+- los módulos que no terminan de importarse antes del tiempo límite (por
+  ejemplo un `while True:` a nivel de módulo).
+
+El hijo (import_profiler_hijo.py) solo importa sys, builtins y time antes de
+medir. Como con -X importtime, no aparecen los módulos que el intérprete ya
+carga al arrancar (os, io, codecs...).
+
+Uso desde la terminal, en la carpeta del módulo:
+
+    python import_profiler.py name_main
+    python import_profiler.py b --path ../../../../../week2/day4/theory --timeout 5
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+import tempfile
+
+# Script que lanza el hijo; solo importa sys, builtins y time antes de medir
+_HIJO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "import_profiler_hijo.py")
+
+
+# ---------------------------------------------------------------------------
+# Proceso padre: lanza el hijo y construye el árbol
+# ---------------------------------------------------------------------------
+
+def _nodo(nombre, padre):
+    return {"modulo": nombre, "padre": padre, "inicio": None, "fin": None,
+            "acumulado_ms": None, "propio_ms": None, "salida": [],
+            "circulares": [], "error": None, "terminado": False, "hijos": []}
+
+
+def _construir_arbol(eventos, fin_proceso):
+    nodos, raices, orden = {}, [], []
+    for evento in eventos:
+        tipo, nombre = evento["evento"], evento.get("modulo")
+        if tipo == "inicio":
+            nodo = _nodo(nombre, evento["padre"])
+            nodo["inicio"] = evento["t"]
+            nodos[nombre] = nodo
+            orden.append(nodo)
+            padre = nodos.get(evento["padre"])
+            (padre["hijos"] if padre else raices).append(nodo)
+        elif tipo == "fin" and nombre in nodos:
+            nodos[nombre].update(fin=evento["t"], error=evento["error"], terminado=True)
+        elif tipo == "salida" and nombre in nodos:
+            nodos[nombre]["salida"].append(evento["texto"].rstrip("\n"))
+        elif tipo == "circular" and nombre in nodos:
+            if evento["importa"] not in nodos[nombre]["circulares"]:
+                nodos[nombre]["circulares"].append(evento["importa"])
+
+    # Los módulos sin evento 'fin' seguían ejecutándose al acabar el proceso
+    for nodo in orden:
+        fin = nodo["fin"] if nodo["terminado"] else fin_proceso
+        nodo["acumulado_ms"] = (fin - nodo["inicio"]) / 1e6
+    for nodo in orden:
+        hijos = sum(hijo["acumulado_ms"] for hijo in nodo["hijos"])
+        nodo["propio_ms"] = max(nodo["acumulado_ms"] - hijos, 0.0)
+        nodo["hijos"].sort(key=lambda hijo: hijo["acumulado_ms"], reverse=True)
+    raices.sort(key=lambda nodo: nodo["acumulado_ms"], reverse=True)
+    return raices
+
+
+def profile_import(modulo, path=None, timeout=60):
+    """
+    Importa `modulo` en un proceso nuevo y devuelve el árbol de importaciones.
+
+    Args:
+        modulo ([str]): Nombre del módulo, p. ej. "name_main".
+        path ([str], optional): Carpeta desde la que se importa. Por defecto
+            la carpeta actual.
+        timeout ([float]): Segundos antes de parar la importación.
+
+    Returns:
+        [dict]: 'arbol' (lista de nodos raíz; cada nodo tiene 'modulo',
+            'propio_ms', 'acumulado_ms', 'salida', 'circulares', 'error',
+            'terminado' y 'hijos'), 'timeout' y 'codigo' de salida del hijo.
+    """
+    path = os.path.abspath(path or os.getcwd())
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta_eventos = os.path.join(carpeta, "eventos.txt")
+        orden = [sys.executable, _HIJO, modulo, path, ruta_eventos]
+        proceso = subprocess.Popen(orden, cwd=path, stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.PIPE)
+        agotado = False
+        try:
+            _, errores = proceso.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proceso.kill()
+            _, errores = proceso.communicate()
+            agotado = True
+        eventos = []
+        if os.path.exists(ruta_eventos):
+            with open(ruta_eventos, encoding="utf-8") as fichero:
+                eventos = [ast.literal_eval(linea) for linea in fichero if linea.strip()]
+    # Los relojes del hijo y del padre no tienen por qué compartir origen: los
+    # módulos que no terminaron se miden hasta el último evento del hijo
+    fin_proceso = max((evento["t"] for evento in eventos), default=0)
+    return {"arbol": _construir_arbol(eventos, fin_proceso), "timeout": agotado,
+            "codigo": proceso.returncode,
+            "stderr": errores.decode(errors="replace")}
+
+
+def _marcas(nodo):
+    marcas = []
+    if nodo["salida"]:
+        marcas.append("imprime {} líneas al importarse".format(len(nodo["salida"])))
+    for importado in nodo["circulares"]:
+        marcas.append("importación circular de '{}'".format(importado))
+    if nodo["error"]:
+        marcas.append("error: " + nodo["error"])
+    if not nodo["terminado"]:
+        marcas.append("NO TERMINA (sigue ejecutándose)")
+    return marcas
+
+
+def format_report(resultado, min_ms=0.0):
+    """Texto con el árbol de `profile_import`, omitiendo nodos de menos de `min_ms`."""
+    lineas = ["{:>10} | {:>10} | módulo".format("propio ms", "acum. ms")]
+
+    def recorrer(nodo, nivel):
+        if nodo["acumulado_ms"] < min_ms and not _marcas(nodo):
+            return
+        marcas = _marcas(nodo)
+        lineas.append("{:>10.2f} | {:>10.2f} | {}{}{}".format(
+            nodo["propio_ms"], nodo["acumulado_ms"], "  " * nivel, nodo["modulo"],
+            "  <- " + "; ".join(marcas) if marcas else ""))
+        for hijo in nodo["hijos"]:
+            recorrer(hijo, nivel + 1)
+
+    for raiz in resultado["arbol"]:
+        recorrer(raiz, 0)
+    if resultado["timeout"]:
+        lineas.append("\nLa importación no terminó antes del tiempo límite.")
+    elif resultado["codigo"]:
+        lineas.append("\nLa importación falló:\n" + resultado["stderr"].strip())
+    return "\n".join(lineas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Perfila la importación de un módulo.")
+    parser.add_argument("modulo")
+    parser.add_argument("--path", default=None)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--min-ms", type=float, default=0.0)
+    args = parser.parse_args(argv)
+    resultado = profile_import(args.modulo, args.path, args.timeout)
+    print(format_report(resultado, args.min_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Proceso hijo de import_profiler.py.
+
+Se ejecuta como script (`python import_profiler_hijo.py modulo path eventos`)
+e importa solo sys, builtins y time antes de instrumentar las importaciones,
+para que módulos como json, subprocess o argparse no estén ya en sys.modules
+y aparezcan en el árbol. Los eventos se escriben como repr de un dict por
+línea (sin json) y el padre los lee con ast.literal_eval.
+"""
+import builtins
+import sys
+import time
+
+
+class _Eventos:
+    """Escribe un evento por línea en el fichero de eventos."""
+
+    def __init__(self, ruta):
+        self.fichero = open(ruta, "w", encoding="utf-8")
+
+    def __call__(self, **evento):
+        evento["t"] = time.perf_counter_ns()
+        self.fichero.write(repr(evento) + "\n")
+        self.fichero.flush()
+
+
+class _SalidaCapturada:
+    """Sustituye a sys.stdout y atribuye lo escrito al módulo en ejecución."""
+
+    def __init__(self, pila, eventos):
+        self.pila = pila
+        self.eventos = eventos
+
+    def write(self, texto):
+        if texto.strip():
+            modulo = self.pila[-1] if self.pila else None
+            self.eventos(evento="salida", modulo=modulo, texto=texto[:200])
+        return len(texto)
+
+    def flush(self):
+        pass
+
+
+class _Buscador:
+    """
+    Buscador de sys.meta_path que delega en los demás y envuelve el
+    exec_module del loader encontrado para medir la ejecución del módulo.
+    """
+
+    def __init__(self, pila, eventos):
+        self.pila = pila
+        self.eventos = eventos
+
+    def find_spec(self, nombre, path=None, target=None):
+        for buscador in sys.meta_path:
+            if buscador is self or not hasattr(buscador, "find_spec"):
+                continue
+            spec = buscador.find_spec(nombre, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        loader = spec.loader
+        # Los loaders de builtins y frozen son clases compartidas: no se tocan
+        if loader is None or isinstance(loader, type) or not hasattr(loader, "exec_module"):
+            return spec
+        exec_module = loader.exec_module
+        pila, eventos = self.pila, self.eventos
+
+        def exec_module_medido(modulo):
+            padre = pila[-1] if pila else None
+            eventos(evento="inicio", modulo=nombre, padre=padre)
+            pila.append(nombre)
+            error = None
+            try:
+                exec_module(modulo)
+            except BaseException as e:
+                error = "{}: {}".format(type(e).__name__, e)
+                raise
+            finally:
+                pila.pop()
+                eventos(evento="fin", modulo=nombre, error=error)
+
+        loader.exec_module = exec_module_medido
+        return spec
+
+
+def _resolver(nombre, paquete, nivel):
+    # Igual que importlib.util.resolve_name, que importaría importlib.util
+    partes = (paquete or "").rsplit(".", nivel - 1)
+    if not partes[0] or len(partes) < nivel:
+        return nombre
+    return partes[0] + "." + nombre if nombre else partes[0]
+
+
+def _instrumentar(ruta_eventos):
+    pila = []
+    eventos = _Eventos(ruta_eventos)
+    sys.meta_path.insert(0, _Buscador(pila, eventos))
+    sys.stdout = _SalidaCapturada(pila, eventos)
+
+    import_original = builtins.__import__
+
+    def import_vigilado(name, globals=None, locals=None, fromlist=(), level=0):
+        if pila:
+            absoluto = _resolver(name, (globals or {}).get("__package__"), level) \
+                if level else name
+            # Los ciclos dentro de un mismo paquete son habituales (numpy,
+            # pandas...): solo se marcan los ciclos entre paquetes distintos
+            if absoluto in pila[:-1] and \
+                    absoluto.split(".")[0] != pila[-1].split(".")[0]:
+                eventos(evento="circular", modulo=pila[-1], importa=absoluto)
+        return import_original(name, globals, locals, fromlist, level)
+
+    builtins.__import__ = import_vigilado
+
+
+def main():
+    modulo, ruta, ruta_eventos = sys.argv[1:4]
+    # La carpeta de este script no debe ser importable, sino la del módulo
+    sys.path[0] = ruta
+    _instrumentar(ruta_eventos)
+    __import__(modulo)
+
+
+if __name__ == "__main__":
+    main()
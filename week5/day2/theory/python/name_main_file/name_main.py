@@ -4,26 +4,42 @@ variable built-in __name__:
 1- Tiene el valor de "__main__" si se ejecuta ese fichero
 2- Tiene el valor del nombre del fichero si se está importando
 
+Los prints a nivel de módulo están en hooks de module_init: se ejecutan al
+importar salvo en modo "lazy" (MODULE_INIT=lazy), en el que importar este
+fichero no imprime nada.
 """
 
 #from a import x
 import a
 import numpy as np
+import os
+import sys
 
-print("a.__name__:", a.__name__)
+# module_init.py está en others/resources/python/utils, junto a la raíz del repositorio
+path_utils = os.path.abspath(os.path.join(os.path.dirname(__file__), *[".."] * 5,
+                                          "others", "resources", "python", "utils"))
+if path_utils not in sys.path:
+    sys.path.append(path_utils)
 
-#Code
-#x()
+from module_init import init_hook, finish_init
 
-print("-----------")
-print("Ejecución de 'name&main'")
+@init_hook
+def ejecucion():
+    print("a.__name__:", a.__name__)
 
-print("Valor de __name__:", __name__)
+    #Code
+    #x()
 
-if __name__ == "__main__":
-    print("name de 'name&main':")
-    print(__name__)
-    print("EQ")
-print("Fin de ejecución de 'name&main'")
-print("----------")
+    print("-----------")
+    print("Ejecución de 'name&main'")
 
+    print("Valor de __name__:", __name__)
+
+    if __name__ == "__main__":
+        print("name de 'name&main':")
+        print(__name__)
+        print("EQ")
+    print("Fin de ejecución de 'name&main'")
+    print("----------")
+
+finish_init(__name__)
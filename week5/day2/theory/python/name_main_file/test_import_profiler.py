@@ -0,0 +1,21 @@
+from import_profiler import profile_import
+
+
+def _nodos(arbol):
+    for nodo in arbol:
+        yield nodo
+        yield from _nodos(nodo["hijos"])
+
+
+def test_profile_import_json():
+    # json no debe estar ya importado en el hijo
+    resultado = profile_import("json")
+    assert resultado["codigo"] == 0
+    assert [raiz["modulo"] for raiz in resultado["arbol"]] == ["json"]
+    assert resultado["arbol"][0]["hijos"]
+
+
+def test_profile_import_circular():
+    nodos = {nodo["modulo"]: nodo for nodo in _nodos(profile_import("name_main")["arbol"])}
+    assert nodos["a"]["circulares"] == ["name_main"]
+    assert nodos["name_main"]["salida"]
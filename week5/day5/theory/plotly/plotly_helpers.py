@@ -0,0 +1,268 @@
+"""
+Helpers to keep plotly figures small when the data is large.
+
+Every point of a plotly trace ends up in the figure JSON, and SVG scatter
+traces get slow in the browser after a few thousand points. These helpers:
+
+- encode numeric arrays as plotly.js typed arrays ({"dtype", "bdata"}),
+  downcasting floats to float32 when that loses nothing visible and integers
+  to the smallest type that fits,
+- use Scattergl instead of Scatter above SCATTERGL_THRESHOLD points,
+- replace scatters that are too large even for WebGL by a 2-D histogram
+  computed here (a heatmap of counts), so only the bins are sent,
+- export HTML that loads plotly.js from the CDN instead of embedding it.
+
+    fig = go.Figure(scatter_or_density(x, y))
+    export_html(fig, "dashboard.html")
+"""
+import base64
+import os
+
+import numpy as np
+import plotly.graph_objects as go
+
+SCATTERGL_THRESHOLD = 5000
+MAX_SCATTER_POINTS = 200000
+
+# Integer types understood by plotly.js typed arrays (there is no int64)
+_INT_TYPES = [np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32]
+
+
+def _compact_dtype(values, float32=True):
+    if values.dtype == np.bool_:
+        return np.dtype(np.uint8)
+    if np.issubdtype(values.dtype, np.integer):
+        if values.size == 0:
+            return np.dtype(np.uint8)
+        low, high = values.min(), values.max()
+        for dtype in _INT_TYPES:
+            info = np.iinfo(dtype)
+            if info.min <= low and high <= info.max:
+                return np.dtype(dtype)
+        return np.dtype(np.float64)
+    if values.dtype.itemsize <= 4:
+        return np.dtype(np.float32)
+    if float32 and _fits_float32(values):
+        return np.dtype(np.float32)
+    return np.dtype(np.float64)
+
+
+def _fits_float32(values):
+    """
+    True if storing `values` as float32 moves every value by at most
+    1 / 2**20 of their range, which is well below a pixel on any screen.
+    Timestamps or coordinates with a large offset and a small spread fail.
+    """
+    finite = values[np.isfinite(values)]
+    if finite.size == 0:
+        return True
+    with np.errstate(over="ignore", invalid="ignore"):
+        error = np.abs(finite.astype(np.float32).astype(np.float64) - finite).max()
+    return bool(error <= np.ptp(finite) / 2**20)
+
+
+def encode_array(values, float32=True):
+    """
+    Encode a numeric array as a plotly.js typed array.
+
+    Args:
+        values (array-like): 1-D or 2-D numeric values.
+        float32 (bool): Store floats in 4 bytes instead of 8 when that
+            changes no value by more than 1 / 2**20 of the array's range.
+            Otherwise (epoch timestamps, large offsets...) they stay float64.
+
+    Returns:
+        dict or original values: {"dtype", "bdata"[, "shape"]}, or `values`
+            unchanged when they are not numeric (dates, strings...).
+    """
+    if isinstance(values, dict):
+        return values
+    array = np.asarray(values)
+    if array.ndim not in (1, 2) or not (np.issubdtype(array.dtype, np.number) or
+                                        array.dtype == np.bool_):
+        return values
+    if np.iscomplexobj(array):
+        return values
+    dtype = _compact_dtype(array, float32)
+    data = np.ascontiguousarray(array, dtype=dtype.newbyteorder("<"))
+    encoded = {"dtype": dtype.str.lstrip("<|>="),
+               "bdata": base64.b64encode(data.tobytes()).decode("ascii")}
+    if array.ndim == 2:
+        encoded["shape"] = "{}, {}".format(*array.shape)
+    return encoded
+
+
+def decode_array(values):
+    """
+    Inverse of `encode_array`: a {"dtype", "bdata"[, "shape"]} dict as a numpy
+    array. Anything else is returned as np.asarray(values).
+    """
+    if isinstance(values, dict) and "bdata" in values:
+        array = np.frombuffer(base64.b64decode(values["bdata"]),
+                              dtype=np.dtype(values["dtype"]).newbyteorder("<"))
+        if "shape" in values:
+            array = array.reshape([int(n) for n in str(values["shape"]).split(",")])
+        return array
+    return np.asarray(values)
+
+
+def scatter(x, y, threshold=SCATTERGL_THRESHOLD, float32=True, **kwargs):
+    """
+    go.Scatter, or go.Scattergl when there are more than `threshold` points,
+    with x and y encoded by `encode_array`. Other keyword arguments are
+    passed to the trace.
+    """
+    trace = go.Scattergl if len(y) > threshold else go.Scatter
+    if trace is go.Scattergl and "mode" not in kwargs:
+        # Scattergl draws lines+markers by default, too much for many points
+        kwargs["mode"] = "markers"
+    return trace(x=encode_array(x, float32), y=encode_array(y, float32), **kwargs)
+
+
+def bin_2d(x, y, bins=200, range=None, weights=None):
+    """
+    Count the points falling in each cell of a regular 2-D grid.
+
+    Same result as np.histogram2d for regular bins, computed with one
+    np.bincount over the flattened cell index.
+
+    Args:
+        x, y (array-like): Coordinates. NaN values are ignored.
+        bins (int or tuple): Number of bins, or (bins_x, bins_y).
+        range (tuple, optional): ((xmin, xmax), (ymin, ymax)). Defaults to
+            the data range.
+        weights (array-like, optional): Sum these instead of counting.
+
+    Returns:
+        tuple: counts (bins_y, bins_x), x bin centers, y bin centers. Rows are
+            y, as expected by go.Heatmap's z.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    bins_x, bins_y = (bins, bins) if np.ndim(bins) == 0 else bins
+    valid = ~(np.isnan(x) | np.isnan(y))
+    if range is None:
+        range = ((x[valid].min(), x[valid].max()), (y[valid].min(), y[valid].max()))
+    (xmin, xmax), (ymin, ymax) = range
+    valid &= (x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax)
+    x, y = x[valid], y[valid]
+    if weights is not None:
+        weights = np.asarray(weights, dtype=float)[valid]
+
+    # The right edge belongs to the last bin, as in np.histogram2d
+    scale_x = bins_x / ((xmax - xmin) or 1.0)
+    scale_y = bins_y / ((ymax - ymin) or 1.0)
+    col = np.minimum(((x - xmin) * scale_x).astype(np.intp), bins_x - 1)
+    row = np.minimum(((y - ymin) * scale_y).astype(np.intp), bins_y - 1)
+    counts = np.bincount(row * bins_x + col, weights=weights, minlength=bins_x * bins_y)
+    counts = counts.reshape(bins_y, bins_x)
+
+    x_edges = np.linspace(xmin, xmax, bins_x + 1)
+    y_edges = np.linspace(ymin, ymax, bins_y + 1)
+    return counts, (x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2
+
+
+def density_heatmap(x, y, bins=200, range=None, weights=None, float32=True, **kwargs):
+    """
+    go.Heatmap of the `bin_2d` counts of x and y. Empty cells are left blank.
+    Other keyword arguments are passed to the trace.
+    """
+    counts, x_centers, y_centers = bin_2d(x, y, bins, range, weights)
+    z = counts.astype(float)
+    z[counts == 0] = np.nan
+    kwargs.setdefault("colorscale", "Viridis")
+    return go.Heatmap(z=encode_array(z, float32), x=encode_array(x_centers, float32),
+                      y=encode_array(y_centers, float32), **kwargs)
+
+
+def scatter_or_density(x, y, max_points=MAX_SCATTER_POINTS, bins=200,
+                       threshold=SCATTERGL_THRESHOLD, **kwargs):
+    """
+    `scatter` for up to `max_points` points and `density_heatmap` above, so
+    the size of the trace never grows with the data. In the heatmap case
+    only the keyword arguments that go.Heatmap accepts (name, opacity,
+    hovertemplate...) are kept, and marker.colorscale becomes the colorscale.
+    """
+    if len(y) > max_points:
+        return density_heatmap(x, y, bins=bins, **_heatmap_kwargs(kwargs))
+    return scatter(x, y, threshold=threshold, **kwargs)
+
+
+# Per-point properties of a scatter that make no sense for the binned heatmap
+_POINT_PROPS = {"x", "y", "z", "type", "text", "hovertext", "customdata", "ids",
+                "xaxis", "yaxis"}
+
+
+def _heatmap_kwargs(kwargs):
+    valid = go.Heatmap()._valid_props
+    heatmap = {key: value for key, value in kwargs.items()
+               if key in valid and key not in _POINT_PROPS and value is not None}
+    marker = kwargs.get("marker")
+    if marker is not None:
+        marker = marker.to_plotly_json() if hasattr(marker, "to_plotly_json") else marker
+        if marker.get("colorscale") is not None:
+            heatmap.setdefault("colorscale", marker["colorscale"])
+    return heatmap
+
+
+def _compact(obj, float32, min_size):
+    if isinstance(obj, dict):
+        if "bdata" in obj:
+            # plotly already encodes numpy arrays, but keeps them as f8/i8
+            return encode_array(decode_array(obj), float32)
+        return {key: _compact(value, float32, min_size) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple, np.ndarray)) and len(obj) >= min_size:
+        encoded = encode_array(obj, float32)
+        if encoded is not obj:
+            return encoded
+    if isinstance(obj, list):
+        return [_compact(value, float32, min_size) for value in obj]
+    return obj
+
+
+def compact_figure(fig, float32=True, max_scatter_points=None, min_size=16):
+    """
+    Return a copy of `fig` with every numeric array of its traces encoded by
+    `encode_array`, and Scatter traces above SCATTERGL_THRESHOLD points
+    switched to Scattergl.
+
+    Args:
+        fig (go.Figure or dict): Figure to compact.
+        float32 (bool): Store floats in 4 bytes when that is lossless enough
+            (see `encode_array`).
+        max_scatter_points (int, optional): Also replace scatter traces with
+            more points than this by a density heatmap of their x and y.
+        min_size (int): Arrays shorter than this are left as they are.
+    """
+    data = fig.to_plotly_json() if hasattr(fig, "to_plotly_json") else dict(fig)
+    traces = []
+    for trace in data.get("data", []):
+        trace = dict(trace)
+        if trace.get("type", "scatter") in ("scatter", "scattergl"):
+            # Depending on the plotly version x and y come as lists, arrays or
+            # already encoded {"dtype", "bdata"} dicts
+            x, y = trace.get("x"), trace.get("y")
+            n = len(decode_array(y)) if y is not None else 0
+            if max_scatter_points is not None and x is not None and n > max_scatter_points:
+                heatmap = density_heatmap(decode_array(x), decode_array(y), float32=float32,
+                                          **_heatmap_kwargs(trace))
+                traces.append(heatmap.to_plotly_json())
+                continue
+            if n > SCATTERGL_THRESHOLD:
+                trace["type"] = "scattergl"
+        traces.append(_compact(trace, float32, min_size))
+    return go.Figure(data=traces, layout=data.get("layout"))
+
+
+def export_html(fig, path, include_plotlyjs="cdn", compact=True, **kwargs):
+    """
+    Write `fig` to an HTML file and return its size in bytes.
+
+    With include_plotlyjs="cdn" the ~4 MB plotly.js bundle is loaded from the
+    CDN instead of being embedded in every file. Other keyword arguments are
+    passed to `compact_figure`.
+    """
+    if compact:
+        fig = compact_figure(fig, **kwargs)
+    fig.write_html(path, include_plotlyjs=include_plotlyjs)
+    return os.path.getsize(path)